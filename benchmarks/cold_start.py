@@ -0,0 +1,101 @@
+"""Cold start benchmark: import time, startup time and first request latencies.
+
+Every sample runs in a fresh interpreter, once with the startup warm-up
+disabled (STARTUP_WARM_UP_TIMEOUT_SECONDS=0) and once enabled, and reports the
+median of each measure. The first request of each endpoint is compared with a
+second, already warm, one.
+
+Usage:
+    python -m benchmarks.cold_start --samples 5 [--email admin@example.com --password ...]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+HEAVY_MODULES = ("passlib", "fastapi_mail", "jinja2")
+
+
+async def child(product_id: str, email: Optional[str], password: Optional[str]) -> Dict[str, Any]:
+    """Measure one cold start of src.main:app in this interpreter."""
+    import httpx
+
+    started_at = time.perf_counter()
+    from src.main import app
+    results: Dict[str, Any] = {"import_ms": (time.perf_counter() - started_at) * 1000}
+    results["heavy_modules_loaded"] = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    requests = [
+        ("product_get", "GET", f"/products/{product_id}", None),
+        ("product_list", "GET", "/products/", None),
+    ]
+    if email and password:
+        requests.append(("login", "POST", "/authenthicate/", {"email": email, "password": password}))
+
+    started_at = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        results["startup_ms"] = (time.perf_counter() - started_at) * 1000
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark/api/v1") as client:
+            for attempt in ("first", "second"):
+                for name, method, url, body in requests:
+                    started_at = time.perf_counter()
+                    response = await client.request(method, url, json=body)
+                    response.raise_for_status()
+                    results[f"{name}_{attempt}_ms"] = (time.perf_counter() - started_at) * 1000
+    return results
+
+
+async def pick_product_id() -> str:
+    """ID of any product, to be requested by the samples."""
+    from sqlalchemy import select
+
+    from src.database.database import async_engine, async_session
+    from src.models import Product
+
+    async with async_session() as db:
+        product_id = await db.scalar(select(Product.id).limit(1))
+    await async_engine.dispose()
+    if product_id is None:
+        raise SystemExit("Benchmark needs at least one product in the database.")
+    return str(product_id)
+
+
+def run_sample(args: argparse.Namespace, product_id: str, warm: bool) -> Dict[str, Any]:
+    env = {**os.environ}
+    if not warm:
+        env["STARTUP_WARM_UP_TIMEOUT_SECONDS"] = "0"
+    command = [sys.executable, "-m", "benchmarks.cold_start", "--child", product_id]
+    if args.email and args.password:
+        command += ["--email", args.email, "--password", args.password]
+    output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(args: argparse.Namespace) -> None:
+    product_id = asyncio.run(pick_product_id())
+    for warm in (False, True):
+        samples: List[Dict[str, Any]] = [run_sample(args, product_id, warm) for _ in range(args.samples)]
+        print(f"\nwarm-up {'enabled' if warm else 'disabled'} (median of {args.samples} fresh processes)")
+        print(f"  heavy modules loaded by import: {samples[0]['heavy_modules_loaded'] or 'none'}")
+        for key in samples[0]:
+            if key.endswith("_ms"):
+                print(f"  {key[:-3]:<24}{statistics.median(sample[key] for sample in samples):>10.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=5, help="Fresh processes per mode.")
+    parser.add_argument("--email", default=os.getenv("BENCH_EMAIL"), help="Also time the first login (env BENCH_EMAIL).")
+    parser.add_argument("--password", default=os.getenv("BENCH_PASSWORD"), help="Password of --email (env BENCH_PASSWORD).")
+    parser.add_argument("--child", metavar="PRODUCT_ID", help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    if arguments.child:
+        print(json.dumps(asyncio.run(child(arguments.child, arguments.email, arguments.password))))
+    else:
+        main(arguments)
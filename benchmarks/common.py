@@ -0,0 +1,47 @@
+"""This module holds helpers shared by the benchmark scripts."""
+import math
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Sequence
+
+import httpx
+
+
+IN_PROCESS_BASE_URL = "http://benchmark/api/v1"
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence.\n
+    :param sorted_values: values sorted ascending.
+    :param pct: percentile in (0, 100].
+    :return: value, 0.0 for an empty sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+@asynccontextmanager
+async def api_client(
+    base_url: Optional[str] = None,
+    max_connections: int = 100,
+    timeout: float = 30.0
+) -> AsyncIterator[httpx.AsyncClient]:
+    """HTTP client for the API.\n
+    With a base_url requests go over the network to a running server, otherwise
+    src.main:app is started in-process (lifespan included) and driven through ASGI.
+    :param base_url: API base URL, e.g. http://localhost:8080/catalog_api/api/v1.
+    :param max_connections: max open connections to the server.
+    :param timeout: seconds before a request is given up.
+    :return: AsyncClient."""
+    if base_url:
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+            yield client
+        return
+
+    from src.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url=IN_PROCESS_BASE_URL, timeout=timeout) as client:
+            yield client
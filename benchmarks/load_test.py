@@ -0,0 +1,284 @@
+"""End-to-end load benchmark of the API.
+
+Drives the API with concurrent clients, one scenario at a time, and reports
+throughput and p50/p95/p99 latency per scenario. Results can be saved as a
+baseline and later runs compared against it, exiting with status 1 when a
+scenario regresses more than the allowed threshold.
+
+Usage (against a disposable database, products are created and left behind):
+    python -m benchmarks.load_test --email admin@example.com --password ... --save-baseline
+    python -m benchmarks.load_test --email admin@example.com --password ...
+
+The login scenario repeats one email from one IP: raise the AUTH_LOGIN_* throttling
+limits of the benchmarked app, or it measures 429s.
+
+Without --base-url the app runs in-process over ASGI, so client overhead shares
+the event loop with the server; compare runs made the same way only.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import api_client, percentile
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+SEED_PRODUCTS = 200
+
+
+class BenchContext:
+    """State shared by the clients of a run."""
+
+    def __init__(self, email: str, password: str):
+        self.email = email
+        self.password = password
+        self.run_id = uuid.uuid4().hex[:8]
+        self.headers: Dict[str, str] = {}
+        self.product_ids: List[str] = []
+        self._counter = 0
+
+    def next_number(self) -> int:
+        """Unique number of the run, used to build unique SKUs and names."""
+        self._counter += 1
+        return self._counter
+
+    def product_payload(self, kind: str) -> Dict[str, Any]:
+        """Body of a product that doesn't exist yet."""
+        number = self.next_number()
+        return {
+            "sku": f"BENCH-{self.run_id}-{kind}{number}",
+            "name": f"Bench {self.run_id} {kind}{number}",
+            "price": 10 + number % 90,
+            "brand": "Bench",
+        }
+
+
+Scenario = Callable[[httpx.AsyncClient, BenchContext, int], Awaitable[httpx.Response]]
+
+
+async def login(client: httpx.AsyncClient, ctx: BenchContext, n: int) -> httpx.Response:
+    return await client.post("/authenthicate/", json={"email": ctx.email, "password": ctx.password})
+
+
+async def product_get(client: httpx.AsyncClient, ctx: BenchContext, n: int) -> httpx.Response:
+    return await client.get(f"/products/{ctx.product_ids[n % len(ctx.product_ids)]}")
+
+
+async def product_list(client: httpx.AsyncClient, ctx: BenchContext, n: int) -> httpx.Response:
+    return await client.get("/products/", params={"limit": 50})
+
+
+async def product_create(client: httpx.AsyncClient, ctx: BenchContext, n: int) -> httpx.Response:
+    return await client.post("/products/", json=ctx.product_payload("c"), headers=ctx.headers)
+
+
+async def product_update(client: httpx.AsyncClient, ctx: BenchContext, n: int) -> httpx.Response:
+    product_id = ctx.product_ids[n % len(ctx.product_ids)]
+    return await client.put(f"/products/{product_id}", json=ctx.product_payload("u"), headers=ctx.headers)
+
+
+async def user_list(client: httpx.AsyncClient, ctx: BenchContext, n: int) -> httpx.Response:
+    return await client.get("/users/", params={"limit": 50}, headers=ctx.headers)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "login": login,
+    "product_get": product_get,
+    "product_list": product_list,
+    "product_create": product_create,
+    "product_update": product_update,
+    "user_list": user_list,
+}
+
+
+async def setup(client: httpx.AsyncClient, ctx: BenchContext) -> None:
+    """Log in and seed the products read and updated by the scenarios."""
+    response = await login(client, ctx, 0)
+    response.raise_for_status()
+    ctx.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    for _ in range(SEED_PRODUCTS):
+        response = await client.post("/products/", json=ctx.product_payload("s"), headers=ctx.headers)
+        response.raise_for_status()
+        ctx.product_ids.append(response.json()["id"])
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    ctx: BenchContext,
+    scenario: Scenario,
+    clients: int,
+    duration: float,
+    warmup: int
+) -> Dict[str, Any]:
+    """Run scenario with concurrent clients for duration seconds.\n
+    :return: throughput and latency summary."""
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    sequence = iter(range(sys.maxsize))
+
+    async def worker(deadline: Optional[float], record: bool) -> None:
+        done = 0
+        while (deadline is None and done < warmup) or (deadline is not None and time.perf_counter() < deadline):
+            n = next(sequence)
+            started_at = time.perf_counter()
+            try:
+                response = await scenario(client, ctx, n)
+                failed = response.status_code >= 400 and str(response.status_code)
+            except httpx.HTTPError as exc:
+                failed = type(exc).__name__
+            elapsed = time.perf_counter() - started_at
+            done += 1
+            if not record:
+                continue
+            if failed:
+                errors[failed] = errors.get(failed, 0) + 1
+            else:
+                latencies.append(elapsed)
+
+    if warmup:
+        await asyncio.gather(*(worker(None, False) for _ in range(clients)))
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker(started_at + duration, True) for _ in range(clients)))
+    wall_time = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        "requests": len(latencies) + sum(errors.values()),
+        "errors": errors,
+        "throughput": len(latencies) / wall_time,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    max_throughput_regression: float,
+    max_latency_regression: float,
+    latency_slack_ms: float
+) -> List[str]:
+    """Compare results against a baseline.\n
+    :return: description of every regression found."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+
+        min_throughput = reference["throughput"] * (1 - max_throughput_regression)
+        if result["throughput"] < min_throughput:
+            regressions.append(
+                f"{name}: throughput {result['throughput']:.1f} req/s < {min_throughput:.1f} "
+                f"(baseline {reference['throughput']:.1f})"
+            )
+
+        for metric in ("p95", "p99"):
+            max_latency = reference[metric] * (1 + max_latency_regression) + latency_slack_ms
+            if result[metric] > max_latency:
+                regressions.append(
+                    f"{name}: {metric} {result[metric]:.2f}ms > {max_latency:.2f}ms "
+                    f"(baseline {reference[metric]:.2f}ms)"
+                )
+    return regressions
+
+
+def print_report(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]) -> None:
+    """Print a table of results, with baseline values next to them when known."""
+    print(f"{'scenario':<16}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<16}{result['requests']:>10}{sum(result['errors'].values()):>8}"
+            f"{result['throughput']:>10.1f}{result['p50']:>10.2f}{result['p95']:>10.2f}{result['p99']:>10.2f}"
+        )
+        reference = baseline.get(name)
+        if reference:
+            print(
+                f"{'  baseline':<34}{reference['throughput']:>10.1f}"
+                f"{reference['p50']:>10.2f}{reference['p95']:>10.2f}{reference['p99']:>10.2f}"
+            )
+        if result["errors"]:
+            print(f"  errors: {result['errors']}")
+
+
+async def main(args: argparse.Namespace) -> int:
+    ctx = BenchContext(email=args.email, password=args.password)
+    names = args.scenarios or list(SCENARIOS)
+
+    async with api_client(base_url=args.base_url, max_connections=args.clients) as client:
+        await setup(client, ctx)
+        results = {}
+        for name in names:
+            results[name] = await run_scenario(
+                client, ctx, SCENARIOS[name], clients=args.clients, duration=args.duration, warmup=args.warmup
+            )
+
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())["scenarios"]
+
+    print_report(results, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps({"clients": args.clients, "scenarios": results}, indent=2))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({"clients": args.clients, "scenarios": results}, indent=2))
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    exit_code = 0
+    regressions = compare(
+        results, baseline,
+        max_throughput_regression=args.max_throughput_regression,
+        max_latency_regression=args.max_latency_regression,
+        latency_slack_ms=args.latency_slack_ms,
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+        exit_code = 1
+
+    for name, result in results.items():
+        error_rate = sum(result["errors"].values()) / max(result["requests"], 1)
+        if error_rate > args.max_error_rate:
+            print(f"FAILED {name}: error rate {error_rate:.2%} > {args.max_error_rate:.2%}")
+            exit_code = 1
+
+    return exit_code
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="API base URL of a running server; the app runs in-process when omitted.")
+    parser.add_argument("--email", default=os.getenv("BENCH_EMAIL"), help="ADMIN user email (env BENCH_EMAIL).")
+    parser.add_argument("--password", default=os.getenv("BENCH_PASSWORD"), help="ADMIN user password (env BENCH_PASSWORD).")
+    parser.add_argument("--scenarios", nargs="*", choices=list(SCENARIOS), help="Scenarios to run, all by default.")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent clients per scenario.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per scenario.")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per client before measuring.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline.")
+    parser.add_argument("--output", type=Path, help="Also write this run's results to a JSON file.")
+    parser.add_argument("--max-throughput-regression", type=float, default=0.2, help="Allowed throughput drop (0.2 = 20%%).")
+    parser.add_argument("--max-latency-regression", type=float, default=0.2, help="Allowed p95/p99 increase (0.2 = 20%%).")
+    parser.add_argument("--latency-slack-ms", type=float, default=1.0, help="Absolute p95/p99 increase always allowed.")
+    parser.add_argument("--max-error-rate", type=float, default=0.0, help="Allowed share of failed requests.")
+    args = parser.parse_args()
+    if not args.email or not args.password:
+        parser.error("--email and --password (or BENCH_EMAIL/BENCH_PASSWORD) are required")
+    return args
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,94 @@
+"""Per-item cost of serializing a product list response.
+
+Compares the path FastAPI takes when an endpoint returns a model against its
+response_model (validate the rows, then serialize_response re-validates and
+jsonable_encode()s, then JSONResponse dumps) with model_response (validate the
+rows, then one model_dump_json).
+
+Usage:
+    python -m benchmarks.serialization --items 100
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import UTC, datetime
+from typing import Any, Callable, Coroutine, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.helpers.responses import model_response
+from src.models import Product
+from src.schemas import ProductResponseSchema, ProductsResponseSchema
+
+
+def make_products(qty: int) -> List[Product]:
+    """Transient Product rows, as loaded by the list endpoint."""
+    now = datetime.now(UTC)
+    return [
+        Product(
+            id=uuid.uuid4(), sku=f"PROD-{i:05}", name=f"Product {i}", price=10.5 + i,
+            brand="Brand", created_at=now, updated_at=now
+        )
+        for i in range(qty)
+    ]
+
+
+def validate(products: List[Product]) -> ProductsResponseSchema:
+    return ProductsResponseSchema(
+        products=[ProductResponseSchema.model_validate(prod) for prod in products],
+        next_cursor="cursor"
+    )
+
+
+async def bench(func: Callable[[], Coroutine[Any, Any, bytes]], rounds: int, repeat: int) -> float:
+    """Best time of repeat runs of rounds calls, in seconds per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        for _ in range(rounds):
+            await func()
+        best = min(best, (time.perf_counter() - started_at) / rounds)
+    return best
+
+
+async def main(args: argparse.Namespace) -> None:
+    products = make_products(args.items)
+    field = create_model_field(name="Response_get_products", type_=ProductsResponseSchema, mode="serialization")
+
+    async def response_model_json() -> bytes:
+        content = await serialize_response(field=field, response_content=validate(products))
+        return JSONResponse(content).body
+
+    async def response_model_orjson() -> bytes:
+        content = await serialize_response(field=field, response_content=validate(products))
+        return ORJSONResponse(content).body
+
+    async def validated_model_response() -> bytes:
+        return model_response(validate(products)).body
+
+    async def validation_only() -> bytes:
+        validate(products)
+        return b""
+
+    paths = {
+        "response_model + JSONResponse": response_model_json,
+        "response_model + ORJSONResponse": response_model_orjson,
+        "model_response": validated_model_response,
+        "(row validation alone)": validation_only,
+    }
+    print(f"{args.items} products, best of {args.repeat} x {args.rounds} rounds")
+    print(f"{'path':<34}{'per response':>14}{'per item':>12}")
+    for name, func in paths.items():
+        seconds = await bench(func, rounds=args.rounds, repeat=args.repeat)
+        print(f"{name:<34}{seconds * 1e6:>12.1f}us{seconds * 1e6 / args.items:>10.2f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100, help="Products per response.")
+    parser.add_argument("--rounds", type=int, default=200, help="Responses built per timing.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timings taken, the best one is reported.")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,7 @@
+-- migrate:up
+CREATE INDEX IF NOT EXISTS ix_products_created_at_id ON products (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users (created_at, id);
+
+-- migrate:down
+DROP INDEX IF EXISTS ix_users_created_at_id;
+DROP INDEX IF EXISTS ix_products_created_at_id;
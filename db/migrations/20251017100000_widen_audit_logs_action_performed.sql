@@ -0,0 +1,5 @@
+-- migrate:up
+ALTER TABLE audit_logs ALTER COLUMN action_performed TYPE varchar(100);
+
+-- migrate:down
+ALTER TABLE audit_logs ALTER COLUMN action_performed TYPE varchar(20);
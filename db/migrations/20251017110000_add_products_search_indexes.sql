@@ -0,0 +1,16 @@
+-- migrate:up
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Serve ILIKE '%term%' and ILIKE 'term%' on name and brand.
+CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_products_brand_trgm ON products USING gin (brand gin_trgm_ops);
+
+-- Serve brand= equality and price range filters/sorting.
+CREATE INDEX IF NOT EXISTS ix_products_brand_price ON products (brand, price);
+CREATE INDEX IF NOT EXISTS ix_products_price ON products (price);
+
+-- migrate:down
+DROP INDEX IF EXISTS ix_products_price;
+DROP INDEX IF EXISTS ix_products_brand_price;
+DROP INDEX IF EXISTS ix_products_brand_trgm;
+DROP INDEX IF EXISTS ix_products_name_trgm;
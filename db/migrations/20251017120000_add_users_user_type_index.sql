@@ -0,0 +1,5 @@
+-- migrate:up
+CREATE INDEX IF NOT EXISTS ix_users_user_type ON users (user_type);
+
+-- migrate:down
+DROP INDEX IF EXISTS ix_users_user_type;
@@ -0,0 +1,17 @@
+-- migrate:up
+UPDATE products SET updated_at = created_at WHERE updated_at IS NULL;
+CREATE INDEX IF NOT EXISTS ix_products_updated_at_id ON products (updated_at, id);
+
+CREATE TABLE tombstones (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    table_name varchar(63) NOT NULL,
+    record_id UUID NOT NULL,
+
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+CREATE INDEX ix_tombstones_table_name_created_at_id ON tombstones (table_name, created_at, id);
+
+-- migrate:down
+DROP TABLE IF EXISTS tombstones;
+DROP INDEX IF EXISTS ix_products_updated_at_id;
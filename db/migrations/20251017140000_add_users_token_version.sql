@@ -0,0 +1,5 @@
+-- migrate:up
+ALTER TABLE users ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0;
+
+-- migrate:down
+ALTER TABLE users DROP COLUMN IF EXISTS token_version;
@@ -0,0 +1,11 @@
+-- migrate:up
+CREATE INDEX IF NOT EXISTS ix_audit_logs_created_at_id ON audit_logs (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_audit_logs_user_id_created_at_id ON audit_logs (user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_audit_logs_affected_module_created_at_id ON audit_logs (affected_module, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_audit_logs_action_performed_created_at_id ON audit_logs (action_performed, created_at, id);
+
+-- migrate:down
+DROP INDEX IF EXISTS ix_audit_logs_action_performed_created_at_id;
+DROP INDEX IF EXISTS ix_audit_logs_affected_module_created_at_id;
+DROP INDEX IF EXISTS ix_audit_logs_user_id_created_at_id;
+DROP INDEX IF EXISTS ix_audit_logs_created_at_id;
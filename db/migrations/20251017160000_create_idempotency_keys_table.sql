@@ -0,0 +1,17 @@
+-- migrate:up
+CREATE TABLE idempotency_keys (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    key varchar(64) NOT NULL UNIQUE,
+    fingerprint varchar(64),
+    status_code integer,
+    headers jsonb,
+    body bytea,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+CREATE INDEX ix_idempotency_keys_expires_at ON idempotency_keys (expires_at);
+
+-- migrate:down
+DROP TABLE IF EXISTS idempotency_keys;
@@ -1,5 +1,5 @@
 """Application configuration settings module."""
-from typing import List
+from typing import List, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -11,6 +11,9 @@ class CoreSettings(BaseSettings):
     # APP_SETTINGS
     APP_NAME: str = Field(default="Product Catalog API", description="Basic catalog system to manage products.")
     VERSION: str = Field(default="0.1.0", description="Application version")
+    STARTUP_WARM_UP_TIMEOUT_SECONDS: float = Field(
+        default=10.0, description="Max seconds startup waits for warm-up, 0 disables warm-up"
+    )
 
 
     # CORS settings
@@ -19,4 +22,90 @@ class CoreSettings(BaseSettings):
         description="CORS origins",
     )
 
+    # DATABASE POOL settings
+    DB_POOL_SIZE: int = Field(default=5, description="Connections kept open per worker")
+    DB_MAX_OVERFLOW: int = Field(default=10, description="Extra connections allowed above DB_POOL_SIZE")
+    DB_POOL_TIMEOUT: float = Field(default=30.0, description="Seconds to wait for a free connection")
+    DB_POOL_RECYCLE: int = Field(default=1800, description="Seconds after which a connection is replaced, -1 disables")
+    DB_POOL_PRE_PING: bool = Field(default=False, description="Test connections on checkout")
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=100, description="asyncpg prepared statements cached per connection")
+    DB_POOL_WARM_CONNECTIONS: Optional[int] = Field(
+        default=None, description="Connections opened and primed on startup, DB_POOL_SIZE when unset"
+    )
+    DB_REPLICA_URLS: List[str] = Field(
+        default=[], description="postgresql+asyncpg URLs of read replicas, GET endpoints read from them"
+    )
+    DB_REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = Field(default=5.0, description="Seconds between replica checks")
+    DB_REPLICA_MAX_LAG_SECONDS: float = Field(default=10.0, description="Replicas lagging more than this aren't used")
+    DB_READ_YOUR_WRITES_SECONDS: float = Field(
+        default=5.0, description="Seconds a client reads from the primary after a write, 0 disables"
+    )
+    DB_POOL_STATS_LOG_INTERVAL_SECONDS: float = Field(default=0.0, description="Seconds between pool stats logs, 0 disables")
+
+    # OBSERVABILITY settings
+    SERVER_TIMING_ENABLED: bool = Field(default=True, description="Add Server-Timing header to responses")
+    SLOW_REQUEST_THRESHOLD_MS: float = Field(default=500.0, description="Requests slower than this are logged")
+    SLOW_REQUEST_MAX_STATEMENTS: int = Field(default=50, description="Max SQL statements kept for slow request logs")
+    METRICS_ENABLED: bool = Field(default=True, description="Collect request metrics and expose /metrics")
+
+    # AUDIT settings
+    AUDIT_QUEUE_MAXSIZE: int = Field(default=10000, description="Max audit rows waiting to be flushed")
+    AUDIT_BATCH_SIZE: int = Field(default=500, description="Audit rows written per INSERT")
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = Field(default=1.0, description="Max seconds an audit row waits before flush")
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = Field(
+        default=0.5,
+        description="Seconds a request waits on a full audit queue before the row is dropped",
+    )
+    AUDIT_RETENTION_DAYS: float = Field(default=0.0, description="Days audit logs are kept, 0 keeps them forever")
+    AUDIT_PURGE_BATCH_SIZE: int = Field(default=1000, description="Expired audit logs deleted per transaction")
+    AUDIT_PURGE_INTERVAL_SECONDS: float = Field(default=3600.0, description="Seconds between retention purge runs")
+    AUDIT_PURGE_BATCH_PAUSE_SECONDS: float = Field(default=0.1, description="Seconds to sleep between purge batches")
+
+    # PRODUCT CACHE settings
+    PRODUCT_CACHE_TTL_SECONDS: float = Field(default=300.0, description="Seconds a cached product is served")
+    PRODUCT_CACHE_MAXSIZE: int = Field(default=10000, description="Max qty of cached products")
+    PRODUCT_CACHE_MAX_BYTES: int = Field(default=32 * 1024 * 1024, description="Max bytes of cached product bodies")
+    PRODUCT_CACHE_WARM_SIZE: int = Field(default=1000, description="Most recently updated products cached on startup")
+
+    # PRODUCT IMPORT settings
+    PRODUCT_IMPORT_BATCH_SIZE: int = Field(default=1000, description="Rows upserted per INSERT ... ON CONFLICT")
+    PRODUCT_IMPORT_MAX_ROWS: int = Field(default=100000, description="Max rows accepted by a bulk import request")
+    PRODUCT_EXPORT_CHUNK_SIZE: int = Field(default=1000, description="Rows fetched per round trip on catalog export")
+
+    # PRODUCT LOOKUP settings
+    PRODUCT_LOOKUP_MAX_ITEMS: int = Field(default=5000, description="Max IDs or SKUs resolved by a lookup request")
+
+    # IDEMPOTENCY settings
+    IDEMPOTENCY_KEY_TTL_SECONDS: float = Field(default=86400.0, description="Seconds a response is replayed for its key")
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS: float = Field(
+        default=60.0,
+        description="Seconds a retry waits for the first request, must exceed the slowest write"
+    )
+    IDEMPOTENCY_CACHE_MAXSIZE: int = Field(default=10000, description="Max qty of responses kept in memory")
+    IDEMPOTENCY_CACHE_MAX_BYTES: int = Field(default=32 * 1024 * 1024, description="Max bytes of in-memory responses")
+    IDEMPOTENCY_MAX_RESPONSE_BYTES: int = Field(default=1024 * 1024, description="Larger responses aren't stored")
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = Field(default=3600.0, description="Seconds between expired keys purges")
+
+    # CHANGE FEED settings
+    CHANGE_FEED_SAFETY_LAG_SECONDS: float = Field(
+        default=5.0,
+        description="Changes newer than this aren't reported yet, must exceed the longest write transaction"
+    )
+
+    # CHANGE EVENTS settings
+    CHANGE_EVENTS_ENABLED: bool = Field(
+        default=True, description="Publish writes with NOTIFY and LISTEN for other workers' ones to keep caches coherent"
+    )
+    CHANGE_EVENTS_RECONNECT_SECONDS: float = Field(
+        default=5.0, description="Seconds between listener connection checks and reconnection attempts"
+    )
+
+    # EMAIL settings
+    EMAIL_DIGEST_WINDOW_SECONDS: float = Field(
+        default=60.0,
+        description="Seconds admin notifications are collected before being sent as one digest",
+    )
+    EMAIL_DIGEST_MAX_ITEMS: int = Field(default=100, description="Max notifications listed in a digest")
+    EMAIL_RECIPIENTS_CACHE_TTL_SECONDS: float = Field(default=300.0, description="Seconds admin recipients are cached")
+
 core_settings = CoreSettings()
@@ -1,2 +1,3 @@
 from .user_crud import user_crud
-from .product_crud import product_crud
\ No newline at end of file
+from .product_crud import product_crud
+from .audit_crud import audit_crud
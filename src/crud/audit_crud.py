@@ -0,0 +1,93 @@
+"""Generate an Object of CRUD for audit logs."""
+import uuid
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud.base_crud import CRUDBase
+from src.helpers.pagination import decode_cursor, encode_cursor
+from src.models import AuditLog
+
+# Key of the advisory lock held by the worker purging expired audit logs.
+PURGE_LOCK_KEY = 0x61756469
+
+
+class CRUDAudit(CRUDBase):
+    """AuditLog CRUD class.
+    :param CRUDBase: base CRUD."""
+
+    async def get_filtered_page(
+        self,
+        db: AsyncSession,
+        user_id: Optional[uuid.UUID] = None,
+        module: Optional[str] = None,
+        action: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[Sequence[AuditLog], Optional[str]]:
+        """Retrieve a page of audit logs, newest first, by keyset on (created_at, id).
+        Each filter is served by an index on (filter, created_at, id).
+        :param db: Async database session.
+        :param user_id: user who performed the actions.
+        :param module: affected module, e.g. CRUDProduct.
+        :param action: action performed, e.g. CRUDProduct.update_returning.
+        :param since: oldest created_at included.
+        :param until: newest created_at excluded.
+        :param cursor: opaque cursor returned by a previous page, None for the first one.
+        :param limit: qty of logs to retrieve.
+        :return: list of AuditLog objs and the cursor of the next page, if any."""
+        stmt = select(self.model).order_by(self.model.created_at.desc(), self.model.id.desc())
+
+        if user_id is not None:
+            stmt = stmt.where(self.model.user_id == user_id)
+        if module:
+            stmt = stmt.where(self.model.affected_module == module)
+        if action:
+            stmt = stmt.where(self.model.action_performed == action)
+        if since is not None:
+            stmt = stmt.where(self.model.created_at >= since)
+        if until is not None:
+            stmt = stmt.where(self.model.created_at < until)
+
+        before = decode_cursor(cursor)
+        if before:
+            stmt = stmt.where(tuple_(self.model.created_at, self.model.id) < before)
+
+        result = await db.scalars(stmt.limit(limit + 1))
+        logs = result.all()
+
+        if len(logs) > limit:
+            logs = logs[:limit]
+            return logs, encode_cursor(logs[-1])
+        return logs, None
+
+    async def purge_batch(self, db: AsyncSession, before: datetime, batch_size: int) -> Optional[int]:
+        """Delete up to batch_size logs older than before, oldest first, in one short transaction.
+        Rows are picked through the (created_at, id) index and locked rows are skipped,
+        so a batch never waits on nor blocks audit writes for long.
+        :param db: Async database session.
+        :param before: logs created before this time are deleted.
+        :param batch_size: max qty of logs deleted.
+        :return: qty of logs deleted, None when another worker is purging."""
+        if not await db.scalar(select(func.pg_try_advisory_xact_lock(PURGE_LOCK_KEY))):
+            await db.rollback()
+            return None
+
+        expired = (
+            select(self.model.id)
+            .where(self.model.created_at < before)
+            .order_by(self.model.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await db.execute(delete(self.model).where(self.model.id.in_(expired)))
+        await db.commit()
+        return result.rowcount
+
+
+audit_crud = CRUDAudit(AuditLog)
@@ -1,12 +1,24 @@
 import uuid
-from typing import Any, Dict, Union
+from datetime import datetime
+from typing import (Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple,
+                    Union)
 
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy import delete as sql_delete
-from sqlalchemy import select
+from sqlalchemy import any_, bindparam, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models import Product, User
+from src.helpers.pagination import (decode_change_token, decode_cursor,
+                                    encode_change_token, encode_cursor)
+from src.middlewares.exceptions import AlreadyExistException
+from src.models import Product, Tombstone, User
+from src.services import change_events
+
+# SQLSTATE of a unique constraint violation.
+UNIQUE_VIOLATION = "23505"
 
 
 class CRUDBase:
@@ -16,30 +28,158 @@ class CRUDBase:
         :param model: A SQLAlchemy model class."""
         self.model = model
 
+    async def publish(self, db: AsyncSession, op: str, ids: Sequence[uuid.UUID]) -> None:
+        """Tell the other workers, on commit, that rows of self.model changed."""
+        await change_events.publish(db=db, table=self.model.__tablename__, op=op, ids=ids)
+
     async def create(self, obj_in: Dict[str, Any] | dict[str, Any], db: AsyncSession):
         """Create a ModelType object"""
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
 
         db.add(db_obj)
+        await db.flush()
+        await self.publish(db=db, op="create", ids=[db_obj.id])
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
+    async def create_unique(
+        self,
+        obj_in: Dict[str, Any] | dict[str, Any],
+        db: AsyncSession,
+        conflict_message: str = "Resource already exist."
+    ):
+        """Create a ModelType object in a single INSERT ... ON CONFLICT DO NOTHING RETURNING.\n
+        Safe against concurrent creates: a unique violation never reaches the db error handler.\n
+        :param obj_in: obj data.\n
+        :param conflict_message: message of the exception raised on conflict.\n
+        :return: created obj, raises AlreadyExistException if any unique column clashes."""
+        obj_in_data = jsonable_encoder(obj_in)
+        stmt = (
+            pg_insert(self.model)
+            .values(**obj_in_data)
+            .on_conflict_do_nothing()
+            .returning(self.model)
+        )
+
+        db_obj = await db.scalar(stmt)
+        if db_obj is not None:
+            await self.publish(db=db, op="create", ids=[db_obj.id])
+        await db.commit()
+
+        if db_obj is None:
+            raise AlreadyExistException(message=conflict_message)
+        return db_obj
+
     async def get(self, db: AsyncSession, id: uuid.UUID):
         """Get object by ID"""
         result = await db.execute(select(self.model).where(self.model.id == id))
         return result.scalar_one_or_none()
 
+    async def get_many(self, db: AsyncSession, ids: Sequence[uuid.UUID]) -> Sequence[Any]:
+        """Get the objs of many IDs with a single WHERE id = ANY(:ids) query.\n
+        The IDs travel as one array parameter, so the statement is the same for any qty of them.\n
+        :param ids: IDs to retrieve, missing ones are ignored.\n
+        :return: list of self.model objs, in no particular order."""
+        ids_param = bindparam("ids", value=list(ids), type_=ARRAY(self.model.id.type))
+        result = await db.scalars(select(self.model).where(self.model.id == any_(ids_param)))
+        return result.all()
+
     async def get_multi(self, db: AsyncSession, skip: int = 0, limit: int = 100):
         """Retrieve multiple objects of self.model type.\n
         :param skip: results to skip before retrieve records.\n
         :param limit: qty of objs to retrieve.\n
         :return: list of self.model objs."""
-        stmt = select(self.model).offset(skip).limit(limit=limit)
+        stmt = (
+            select(self.model)
+            .order_by(self.model.created_at, self.model.id)
+            .offset(skip)
+            .limit(limit=limit)
+        )
         result = await db.scalars(stmt)
         return result.all()
 
+    async def get_page(
+        self, db: AsyncSession, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[Sequence[Any], Optional[str]]:
+        """Retrieve a page of self.model objs by keyset on (created_at, id).\n
+        Every page costs the same index seek no matter how deep it is.\n
+        :param cursor: opaque cursor returned by a previous page, None for the first one.\n
+        :param limit: qty of objs to retrieve.\n
+        :return: list of self.model objs and the cursor of the next page, if any."""
+        stmt = select(self.model).order_by(self.model.created_at, self.model.id)
+
+        after = decode_cursor(cursor)
+        if after:
+            stmt = stmt.where(tuple_(self.model.created_at, self.model.id) > after)
+
+        result = await db.scalars(stmt.limit(limit + 1))
+        objs = result.all()
+
+        if len(objs) > limit:
+            objs = objs[:limit]
+            return objs, encode_cursor(objs[-1])
+        return objs, None
+
+    async def get_changes(
+        self, db: AsyncSession, until: datetime, since: Optional[str] = None, limit: int = 500
+    ) -> Tuple[Sequence[Any], List[uuid.UUID], str, bool]:
+        """Retrieve objs created/updated and IDs deleted after a change token.\n
+        Changes are read by keyset on (updated_at, id) and tombstones on (created_at, id),
+        so a sync costs O(changes) no matter the table size.\n
+        :param until: changes after this time aren't reported yet.\n
+        :param since: token returned by a previous call, None to read from the beginning.\n
+        :param limit: max qty of changed objs and of deleted IDs retrieved.\n
+        :return: changed objs, deleted IDs, the token to resume from and whether more changes are pending."""
+        changed_after, deleted_after = decode_change_token(since)
+
+        stmt = (
+            select(self.model)
+            .where(tuple_(self.model.updated_at, self.model.id) > changed_after)
+            .where(self.model.updated_at <= until)
+            .order_by(self.model.updated_at, self.model.id)
+            .limit(limit + 1)
+        )
+        objs = (await db.scalars(stmt)).all()
+
+        stmt = (
+            select(Tombstone)
+            .where(Tombstone.table_name == self.model.__tablename__)
+            .where(tuple_(Tombstone.created_at, Tombstone.id) > deleted_after)
+            .where(Tombstone.created_at <= until)
+            .order_by(Tombstone.created_at, Tombstone.id)
+            .limit(limit + 1)
+        )
+        tombstones = (await db.scalars(stmt)).all()
+
+        has_more = len(objs) > limit or len(tombstones) > limit
+        objs, tombstones = objs[:limit], tombstones[:limit]
+        if objs:
+            changed_after = (objs[-1].updated_at, objs[-1].id)
+        if tombstones:
+            deleted_after = (tombstones[-1].created_at, tombstones[-1].id)
+
+        next_token = encode_change_token(changed_after=changed_after, deleted_after=deleted_after)
+        return objs, [tombstone.record_id for tombstone in tombstones], next_token, has_more
+
+    async def stream(self, db: AsyncSession, chunk_size: int = 1000) -> AsyncIterator[Sequence[Any]]:
+        """Stream every self.model obj in chunks over a server side cursor.\n
+        Only one chunk is held in memory at a time.\n
+        :param chunk_size: qty of objs fetched per round trip.\n
+        :return: async iterator of lists of self.model objs."""
+        stmt = (
+            select(self.model)
+            .order_by(self.model.created_at, self.model.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await db.stream_scalars(stmt)
+        async for partition in result.partitions(chunk_size):
+            yield partition
+            # Objs already written out don't need to stay in the identity map.
+            for obj in partition:
+                db.expunge(obj)
+
     async def update(self, db: AsyncSession, db_obj: Union[User, Product], obj_in: dict):
         """Update object"""
         for field, value in obj_in.items():
@@ -47,12 +187,54 @@ class CRUDBase:
                 setattr(db_obj, field, value)
 
         db.add(db_obj)
+        await self.publish(db=db, op="update", ids=[db_obj.id])
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
+    async def update_returning(
+        self,
+        db: AsyncSession,
+        id: uuid.UUID,
+        obj_in: Dict[str, Any],
+        expected_updated_at: Optional[Sequence[datetime]] = None,
+        conflict_message: str = "Resource already exist."
+    ):
+        """Update object in a single UPDATE ... WHERE id = :id [AND updated_at IN (:versions)] RETURNING.\n
+        No prior read: existence, the optimistic lock and unique columns are all checked by the statement.\n
+        :param id: ID of the obj to update.\n
+        :param obj_in: columns to set, updated_at is set too.\n
+        :param expected_updated_at: updated_at values the obj may have (e.g. from If-Match), None skips the check.\n
+        :param conflict_message: message of the exception raised on a unique violation.\n
+        :return: updated obj, None when missing or modified since; raises AlreadyExistException if any unique column clashes."""
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**obj_in)
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        if expected_updated_at is not None:
+            stmt = stmt.where(self.model.updated_at.in_(expected_updated_at))
+
+        try:
+            db_obj = await db.scalar(stmt)
+        except IntegrityError as exc:
+            await db.rollback()
+            if getattr(exc.orig, "sqlstate", None) == UNIQUE_VIOLATION:
+                raise AlreadyExistException(message=conflict_message) from exc
+            raise
+
+        if db_obj is not None:
+            await self.publish(db=db, op="update", ids=[db_obj.id])
+        await db.commit()
+        return db_obj
+
     async def delete(self, db: AsyncSession, id: uuid.UUID):
-        """Delete object by ID"""
-        await db.execute(sql_delete(self.model).where(self.model.id == id))
+        """Delete object by ID, leaving a tombstone of it for change feeds."""
+        result = await db.execute(sql_delete(self.model).where(self.model.id == id).returning(self.model.id))
+        if result.scalar_one_or_none() is not None:
+            db.add(Tombstone(table_name=self.model.__tablename__, record_id=id))
+            await self.publish(db=db, op="delete", ids=[id])
         await db.commit()
         return True
@@ -1,11 +1,25 @@
 """
 Generate an Object of CRUD for products
 """
-from sqlalchemy import select
+import uuid
+from datetime import UTC, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import any_, bindparam, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud.base_crud import CRUDBase
 from src.models import Product
+from src.services.product_cache import product_cache
+from src.utils.enumerators import ProductSortField, SortOrder
+
+
+def _escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 class CRUDProduct(CRUDBase):
@@ -28,5 +42,150 @@ class CRUDProduct(CRUDBase):
         stmt = select(self.model).where(self.model.name == name)
         return await db.scalar(stmt)
 
+    async def get_many_by_sku(self, skus: Sequence[str], db: AsyncSession) -> Sequence[Product]:
+        """Retrieve the products of many SKUs with a single WHERE sku = ANY(:skus) query.
+        :param skus: SKUs to retrieve, missing ones are ignored.
+        :param db: Async database session.
+        :return: list of Product objs, in no particular order."""
+        skus_param = bindparam("skus", value=list(skus), type_=ARRAY(self.model.sku.type))
+        result = await db.scalars(select(self.model).where(self.model.sku == any_(skus_param)))
+        return result.all()
+
+    async def get_recently_updated(self, db: AsyncSession, limit: int) -> Sequence[Product]:
+        """Retrieve the most recently created/updated products.
+        :param db: Async database session.
+        :param limit: qty of products to retrieve.
+        :return: list of Product objs, newest first."""
+        stmt = (
+            select(self.model)
+            .order_by(self.model.updated_at.desc(), self.model.id.desc())
+            .limit(limit)
+        )
+        result = await db.scalars(stmt)
+        return result.all()
+
+    async def search(
+        self,
+        db: AsyncSession,
+        q: Optional[str] = None,
+        prefix: Optional[str] = None,
+        brand: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        sort: ProductSortField = ProductSortField.NAME,
+        order: SortOrder = SortOrder.ASC,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Sequence[Product]:
+        """Search products, every filter is served by an index.
+        :param db: Async database session.
+        :param q: case insensitive substring of name or brand (trigram indexes).
+        :param prefix: case insensitive name prefix (trigram index).
+        :param brand: exact brand.
+        :param min_price: lowest price included.
+        :param max_price: highest price included.
+        :param sort: column to sort by, id breaks ties.
+        :param order: sort direction.
+        :param skip: results to skip before retrieve records.
+        :param limit: qty of objs to retrieve.
+        :return: list of Product objs."""
+        stmt = select(self.model)
+
+        if q:
+            pattern = f"%{_escape_like(q)}%"
+            stmt = stmt.where(or_(self.model.name.ilike(pattern), self.model.brand.ilike(pattern)))
+        if prefix:
+            stmt = stmt.where(self.model.name.ilike(f"{_escape_like(prefix)}%"))
+        if brand:
+            stmt = stmt.where(self.model.brand == brand)
+        if min_price is not None:
+            stmt = stmt.where(self.model.price >= min_price)
+        if max_price is not None:
+            stmt = stmt.where(self.model.price <= max_price)
+
+        column = getattr(self.model, sort.value)
+        if order is SortOrder.DESC:
+            stmt = stmt.order_by(column.desc(), self.model.id.desc())
+        else:
+            stmt = stmt.order_by(column.asc(), self.model.id.asc())
+
+        result = await db.scalars(stmt.offset(skip).limit(limit))
+        return result.all()
+
+    async def create(self, obj_in: Dict[str, Any] | dict[str, Any], db: AsyncSession) -> Product:
+        """Create Product obj and drop any cached entry under its ID."""
+        product = await super().create(obj_in=obj_in, db=db)
+        product_cache.invalidate(product.id)
+        return product
+
+    async def create_unique(
+        self,
+        obj_in: Dict[str, Any] | dict[str, Any],
+        db: AsyncSession,
+        conflict_message: str = "SKU or name already exists."
+    ) -> Product:
+        """Create Product obj in one round trip and drop any cached entry under its ID."""
+        product = await super().create_unique(obj_in=obj_in, db=db, conflict_message=conflict_message)
+        product_cache.invalidate(product.id)
+        return product
+
+    async def update(self, db: AsyncSession, db_obj: Product, obj_in: dict) -> Product:
+        """Update Product obj and evict it from product cache."""
+        product = await super().update(db=db, db_obj=db_obj, obj_in=obj_in)
+        product_cache.invalidate(product.id)
+        return product
+
+    async def update_returning(
+        self,
+        db: AsyncSession,
+        id: uuid.UUID,
+        obj_in: Dict[str, Any],
+        expected_updated_at: Optional[Sequence[datetime]] = None,
+        conflict_message: str = "SKU or name already exists."
+    ) -> Optional[Product]:
+        """Update Product obj in one statement and evict it from product cache."""
+        product = await super().update_returning(
+            db=db, id=id, obj_in=obj_in,
+            expected_updated_at=expected_updated_at, conflict_message=conflict_message
+        )
+        if product is not None:
+            product_cache.invalidate(product.id)
+        return product
+
+    async def delete(self, db: AsyncSession, id: uuid.UUID):
+        """Delete Product obj by ID and evict it from product cache."""
+        deleted = await super().delete(db=db, id=id)
+        product_cache.invalidate(id)
+        return deleted
+
+    async def bulk_upsert(self, rows: List[Dict[str, Any]], db: AsyncSession) -> Sequence[Row]:
+        """Insert or update many products by SKU with a single statement.
+        SKUs must be unique within rows.
+        :param rows: products data.
+        :param db: Async database session.
+        :return: (id, sku, inserted) rows, inserted is False for updated products."""
+        stmt = pg_insert(self.model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.sku],
+            set_={
+                "name": stmt.excluded.name,
+                "price": stmt.excluded.price,
+                "brand": stmt.excluded.brand,
+                "updated_at": datetime.now(UTC),
+            }
+        ).returning(
+            self.model.id, self.model.sku, literal_column("(xmax = 0)").label("inserted")
+        )
+
+        result = await db.execute(stmt)
+        upserted = result.all()
+        await self.publish(db=db, op="upsert", ids=[row.id for row in upserted])
+        await db.commit()
+
+        for row in upserted:
+            if not row.inserted:
+                product_cache.invalidate(row.id)
+        return upserted
+
 
 product_crud = CRUDProduct(Product)
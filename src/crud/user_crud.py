@@ -1,4 +1,5 @@
 """Generate an Object of CRUD for users. """
+import uuid
 from typing import Any, Dict
 
 from fastapi.encoders import jsonable_encoder
@@ -9,7 +10,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.crud.base_crud import CRUDBase
 from src.models import User
 from src.schemas import UserCreateSchema
-from src.services.auth import get_password_hash
+from src.services.auth import password_hasher, token_versions
+from src.services.auth.versions import DELETED
+from src.services.email import EmailService
 
 
 class CRUDUser(CRUDBase):
@@ -22,12 +25,15 @@ class CRUDUser(CRUDBase):
         :param db: Async db session.
         :return: User obj."""
         obj_in_data = jsonable_encoder(obj_in)
-        obj_in_data['password'] = get_password_hash(obj_in_data['password'])
+        obj_in_data['password'] = await password_hasher.hash(obj_in_data['password'])
         db_obj = self.model(**obj_in_data)  # type: ignore
 
         db.add(db_obj)
+        await db.flush()
+        await self.publish(db=db, op="create", ids=[db_obj.id])
         await db.commit()
         await db.refresh(db_obj)
+        EmailService.invalidate_recipients()
         return db_obj
 
     async def get_by_email(self, email: str, db: AsyncSession) -> User:
@@ -43,6 +49,39 @@ class CRUDUser(CRUDBase):
             await db.rollback()
             raise ie
 
+    async def update(self, db: AsyncSession, db_obj: User, obj_in: dict) -> User:
+        """Update User obj, revoking its issued tokens on identity/role/password changes.
+        A plain password in obj_in is hashed here, once the user is known to exist.
+        :param db: Async db session.
+        :param db_obj: User obj to update.
+        :param obj_in: user's data to update.
+        :return: User obj."""
+        changes_principal = any(
+            field in obj_in and obj_in[field] != getattr(db_obj, field)
+            for field in ("email", "user_type")
+        )
+        revokes_tokens = changes_principal or bool(obj_in.get("password"))
+
+        if obj_in.get("password"):
+            obj_in = {**obj_in, "password": await password_hasher.hash(obj_in["password"])}
+        if revokes_tokens:
+            # Bumped by the db so concurrent updates can't hand out the same version twice.
+            obj_in = {**obj_in, "token_version": self.model.token_version + 1}
+
+        updated_user = await super().update(db=db, db_obj=db_obj, obj_in=obj_in)
+
+        if revokes_tokens:
+            token_versions.set(updated_user.id, updated_user.token_version)
+        if changes_principal:
+            EmailService.invalidate_recipients()
+        return updated_user
+
+    async def delete(self, db: AsyncSession, id: uuid.UUID):
+        """Delete User obj by ID and revoke its issued tokens."""
+        deleted = await super().delete(db=db, id=id)
+        token_versions.set(id, DELETED)
+        EmailService.invalidate_recipients()
+        return deleted
 
 
 user_crud = CRUDUser(User)
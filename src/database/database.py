@@ -1,5 +1,8 @@
 import os
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from src.config.core import core_settings
+from src.database.pool import InstrumentedQueuePool
 
 
 PG_PORT = os.getenv("POSTGRES_PORT")
@@ -10,6 +13,22 @@ PG_NAME = os.getenv("POSTGRES_NAME")
 
 PG_URL = f"postgresql+asyncpg://{PG_USER}:{PG_PASSWORD}@{PG_HOST}:{PG_PORT}/{PG_NAME}"
 
-async_engine = create_async_engine(url=PG_URL)
+
+def build_engine(url: str) -> AsyncEngine:
+    """Create an engine with the app pool settings.\n
+    :param url: postgresql+asyncpg connection URL."""
+    return create_async_engine(
+        url=url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=core_settings.DB_POOL_SIZE,
+        max_overflow=core_settings.DB_MAX_OVERFLOW,
+        pool_timeout=core_settings.DB_POOL_TIMEOUT,
+        pool_recycle=core_settings.DB_POOL_RECYCLE,
+        pool_pre_ping=core_settings.DB_POOL_PRE_PING,
+        connect_args={"prepared_statement_cache_size": core_settings.DB_STATEMENT_CACHE_SIZE},
+    )
+
+
+async_engine = build_engine(PG_URL)
 
 async_session = async_sessionmaker(bind=async_engine, expire_on_commit=False)
@@ -0,0 +1,125 @@
+"""This module routes reads to read replicas."""
+import asyncio
+import itertools
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from src.config.core import core_settings
+from src.database.database import build_engine
+from src.utils.logger import get_logger
+
+
+logger = get_logger()
+
+# Replay lag in seconds, 0 when every received WAL record has been replayed
+# (an idle primary would otherwise look more and more behind) or when the
+# server isn't a standby at all.
+LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class Replica:
+    """A read replica engine and its last known health."""
+
+    def __init__(self, url: str):
+        """:param url: postgresql+asyncpg connection URL."""
+        self.engine = build_engine(url)
+        self.session = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.name = self.engine.url.render_as_string(hide_password=True)
+        self.healthy = False
+        self.checked = False
+        self.lag: Optional[float] = None
+
+
+class ReplicaPool:
+    """Round-robin over the healthy read replicas.\n
+    A background task checks every replica each health check interval; one
+    that can't be reached or lags more than max_lag seconds is skipped until a
+    later check finds it back. With no healthy replica reads go to the primary."""
+
+    def __init__(self, urls: List[str], check_interval: float, max_lag: float):
+        """:param urls: replica connection URLs, none disables routing.
+        :param check_interval: seconds between health checks.
+        :param max_lag: max replay lag in seconds of a replica still used."""
+        self.replicas = [Replica(url) for url in urls]
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self._next = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def engines(self) -> List[AsyncEngine]:
+        """Engines of every replica, healthy or not."""
+        return [replica.engine for replica in self.replicas]
+
+    @property
+    def healthy_count(self) -> int:
+        """Qty of replicas currently used."""
+        return sum(replica.healthy for replica in self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        """Next healthy replica, None when there is none."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    async def check(self) -> None:
+        """Check every replica at once and update its health."""
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                replica.lag = float(await asyncio.wait_for(conn.scalar(LAG_QUERY), timeout=self.check_interval))
+            healthy = replica.lag <= self.max_lag
+            reason = f"lag {replica.lag:.1f}s"
+        except Exception as e:
+            replica.lag = None
+            healthy = False
+            reason = repr(e)
+
+        if healthy != replica.healthy or not replica.checked:
+            log = logger.info if healthy else logger.warning
+            log(f"Read replica {replica.name} is {'up' if healthy else 'down'} ({reason}).")
+        replica.healthy = healthy
+        replica.checked = True
+
+    def start(self) -> None:
+        """Start the health check task on the running loop if it isn't running."""
+        if not self.replicas:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="replica-health-check")
+
+    async def stop(self) -> None:
+        """Stop the health check task and close replica connections."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"An unexpected error checking read replicas has occurred. {e}")
+            await asyncio.sleep(self.check_interval)
+
+
+replica_pool = ReplicaPool(
+    urls=core_settings.DB_REPLICA_URLS,
+    check_interval=core_settings.DB_REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+    max_lag=core_settings.DB_REPLICA_MAX_LAG_SECONDS,
+)
@@ -1,3 +1,5 @@
+from .admin_endpoints import admin_router
+from .audit_endpoints import audit_router
 from .auth_endpoint import auth_router
 from .product_endpoints import product_router
 from .user_endpoints import user_router
@@ -0,0 +1,24 @@
+"""This module handles admin diagnostics endpoints."""
+from fastapi import APIRouter, Depends, Response
+
+from src.database.database import async_engine
+from src.helpers.responses import model_response
+from src.schemas import PoolStatsResponseSchema
+from src.services.auth.services import require_admin_user
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin_user)]
+)
+
+
+@router.get("/pool", response_model=PoolStatsResponseSchema)
+async def get_pool_stats() -> Response:
+    """Report db connection pool usage of this worker.\n
+    :return: PoolStatsResponseSchema response."""
+    return model_response(PoolStatsResponseSchema(**async_engine.pool.stats()))
+
+
+admin_router = router
@@ -0,0 +1,73 @@
+"""This module handles audit log endpoints."""
+from datetime import UTC, datetime
+from typing import Annotated, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud import audit_crud
+from src.helpers.db import get_read_db
+from src.helpers.responses import model_response
+from src.middlewares.exceptions import (AppException, BadRequestException,
+                                        NotFoundException)
+from src.middlewares.timing import timed
+from src.schemas import AuditLogResponseSchema, AuditLogsResponseSchema
+from src.services.auth.services import require_admin_user
+
+
+router = APIRouter(
+    prefix="/audit",
+    tags=["Audit"],
+    dependencies=[Depends(require_admin_user)]
+)
+
+
+@router.get("/", response_model=AuditLogsResponseSchema)
+async def get_audit_logs(
+    user_id: Optional[UUID] = None,
+    module: Annotated[Optional[str], Query(max_length=100)] = None,
+    action: Annotated[Optional[str], Query(max_length=100)] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 100,
+    db: AsyncSession = Depends(get_read_db)
+) -> Response:
+    """Retrieve audit logs, newest first.\n
+    :param user_id: user who performed the actions.\n
+    :param module: affected module, e.g. CRUDProduct.\n
+    :param action: action performed, e.g. CRUDProduct.update_returning.\n
+    :param since: oldest creation time included, UTC when no offset is given.\n
+    :param until: newest creation time excluded, UTC when no offset is given.\n
+    :param cursor: next_cursor value of a previous page.\n
+    :param limit: Qty of records to being retrieved.\n
+    :return: AuditLogsResponseSchema response."""
+    try:
+        # created_at is timestamptz, naive bounds would be compared with aware ones.
+        if since is not None and since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+        if until is not None and until.tzinfo is None:
+            until = until.replace(tzinfo=UTC)
+        if since is not None and until is not None and since >= until:
+            raise BadRequestException(message="since must be before until.")
+
+        logs, next_cursor = await audit_crud.get_filtered_page(
+            db=db, user_id=user_id, module=module, action=action,
+            since=since, until=until, cursor=cursor, limit=limit
+        )
+        if not logs:
+            raise NotFoundException(message="No audit logs found.")
+
+        with timed("serialize"):
+            response = AuditLogsResponseSchema(
+                audit_logs=[AuditLogResponseSchema.model_validate(log) for log in logs],
+                next_cursor=next_cursor
+                )
+        return model_response(response)
+
+    except AppException as exc:
+        raise exc
+
+
+audit_router = router
@@ -1,10 +1,11 @@
 """This module handle auth endpoint."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.helpers.db import get_db
+from src.helpers.responses import model_response
 from src.schemas import TokenResponse, UserAuthSchema
-from src.services.auth import generate_token
+from src.services.auth import generate_token, login_throttle
 
 
 router = APIRouter(
@@ -14,11 +15,14 @@ router = APIRouter(
 
 
 @router.post('/', description='User authentication.', response_model=TokenResponse)
-async def login_for_access_token(authenticate: UserAuthSchema, db: AsyncSession = Depends(get_db)) -> TokenResponse:
-    """Returns The generated access token."""
+async def login_for_access_token(
+    authenticate: UserAuthSchema, request: Request, db: AsyncSession = Depends(get_db)
+) -> Response:
+    """Returns The generated access token, 429 with Retry-After when attempts are throttled."""
     try:
+        await login_throttle.check(request=request, email=authenticate.email)
         access_token = await generate_token(db=db, email=authenticate.email, password=authenticate.password)
-        return TokenResponse(access_token=access_token, token_type="bearer")
+        return model_response(TokenResponse(access_token=access_token, token_type="bearer"))
 
     except HTTPException as http_ex:
         raise http_ex
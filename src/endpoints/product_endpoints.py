@@ -1,27 +1,41 @@
 """This module handles Product endpoints operations."""
-from typing import Annotated
+from datetime import UTC, datetime, timedelta
+from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Request
+from fastapi import (APIRouter, BackgroundTasks, Depends, Header, Query,
+                     Request, Response, status)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config.core import core_settings
 from src.crud import product_crud
-from src.helpers.db import get_db
-from src.middlewares.exceptions import (AlreadyExistException, AppException,
-                                        NotFoundException)
-from src.models import User
-from src.schemas import (ProductCreateSchema, ProductResponseSchema,
+from src.helpers.db import (get_db, get_read_db, get_write_db, is_replica,
+                            read_sessionmaker)
+from src.helpers.responses import model_response
+from src.middlewares.exceptions import (AppException, NotFoundException,
+                                        PreconditionFailedException)
+from src.middlewares.timing import timed
+from src.schemas import (ProductChangesResponseSchema, ProductCreateSchema,
+                         ProductImportResponseSchema, ProductLookupItemSchema,
+                         ProductLookupResponseSchema, ProductLookupSchema,
+                         ProductPatchSchema, ProductResponseSchema,
                          ProductsResponseSchema, ProductUpdateSchema)
 from src.services.audit import AuditService
+from src.services.auth import Principal
 from src.services.auth.services import get_current_user, require_admin_user
 from src.services.email import EmailService
+from src.services.product_cache import product_cache
+from src.services.product_export import export_products
+from src.services.product_import import ProductImportService
+from src.utils.enumerators import ImportFormat, ProductSortField, SortOrder
 
 
 router = APIRouter(
     prefix="/products",
     tags=["Products"]
 )
-currentUser = Annotated[User, Depends(get_current_user)]
+currentUser = Annotated[Principal, Depends(get_current_user)]
 
 
 @router.post("/", dependencies=[Depends(require_admin_user)], response_model=ProductResponseSchema)
@@ -29,22 +43,180 @@ async def create_product(
     product_in: ProductCreateSchema,
     current_user: currentUser,
     request: Request,
-    db: AsyncSession = Depends(get_db)
-) -> ProductResponseSchema:
+    db: AsyncSession = Depends(get_write_db)
+) -> Response:
     """Add new product if doesn't exist.\n
     :param product_in: ProductCreateSchema schema input.\n
     :return: ProductResponseSchema response."""
     try:
-        if await product_crud.get_by_sku(sku=product_in.sku, db=db):
-            raise AlreadyExistException(message="SKU already exists.")
-
-        product = await product_crud.create(db=db, obj_in=product_in.model_dump())
+        product = await product_crud.create_unique(db=db, obj_in=product_in.model_dump())
         await AuditService.register(
-            current_user=current_user, db=db, request=request,
-            action=product_crud.create, data=product_in.model_dump()
+            current_user=current_user, request=request,
+            action=product_crud.create_unique, data=product_in.model_dump()
             )
 
-        return ProductResponseSchema.model_validate(product)
+        return model_response(ProductResponseSchema.model_validate(product))
+
+    except AppException as exc:
+        raise exc
+
+
+@router.post(
+    "/bulk",
+    dependencies=[Depends(require_admin_user)],
+    response_model=ProductImportResponseSchema,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+            "required": True,
+        }
+    },
+)
+async def import_products(
+    current_user: currentUser,
+    request: Request,
+    fmt: Annotated[Optional[ImportFormat], Query(alias="format")] = None,
+    db: AsyncSession = Depends(get_write_db)
+) -> Response:
+    """Create or update products by SKU from a streamed NDJSON or CSV body.\n
+    CSV bodies must start with a header row naming sku, name, price and brand columns.\n
+    :param fmt: body format, taken from Content-Type when omitted.\n
+    :return: ProductImportResponseSchema per row report."""
+    try:
+        if fmt is None:
+            content_type = request.headers.get("content-type", "")
+            fmt = ImportFormat.CSV if "csv" in content_type else ImportFormat.NDJSON
+
+        service = ProductImportService(db=db, current_user=current_user, request=request)
+        return model_response(await service.run(fmt=fmt))
+
+    except AppException as exc:
+        raise exc
+
+
+@router.post("/lookup", response_model=ProductLookupResponseSchema)
+async def lookup_products(
+    lookup_in: ProductLookupSchema,
+    db: AsyncSession = Depends(get_read_db)
+) -> Response:
+    """Retrieve many products by their IDs or SKUs in a single query.\n
+    :param lookup_in: ProductLookupSchema input, either ids or skus.\n
+    :return: ProductLookupResponseSchema response, one result per requested key in request order."""
+    try:
+        if lookup_in.ids is not None:
+            keys = lookup_in.ids
+            products = await product_crud.get_many(db=db, ids=set(keys)) if keys else []
+            by_key = {product.id: product for product in products}
+        else:
+            keys = lookup_in.skus
+            products = await product_crud.get_many_by_sku(skus=set(keys), db=db) if keys else []
+            by_key = {product.sku: product for product in products}
+
+        with timed("serialize"):
+            validated = {key: ProductResponseSchema.model_validate(product) for key, product in by_key.items()}
+            results = [
+                ProductLookupItemSchema(key=str(key), found=key in validated, product=validated.get(key))
+                for key in keys
+            ]
+            found = sum(result.found for result in results)
+            response = ProductLookupResponseSchema(results=results, found=found, missing=len(results) - found)
+        return model_response(response)
+
+    except AppException as exc:
+        raise exc
+
+
+@router.get(
+    "/export",
+    dependencies=[Depends(get_current_user)],
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def export_catalog(
+    request: Request,
+    fmt: Annotated[ImportFormat, Query(alias="format")] = ImportFormat.NDJSON,
+) -> StreamingResponse:
+    """Stream the whole catalog, memory stays flat regardless of its size.\n
+    :param fmt: ndjson (one product per line) or csv.\n
+    :return: StreamingResponse response."""
+    media_type = "text/csv" if fmt is ImportFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        export_products(fmt=fmt, sessionmaker=read_sessionmaker(request)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="products.{fmt.value}"'}
+    )
+
+
+@router.get("/changes", dependencies=[Depends(get_current_user)], response_model=ProductChangesResponseSchema)
+async def get_product_changes(
+    since: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 500,
+    db: AsyncSession = Depends(get_db)
+) -> Response:
+    """Retrieve products created/updated and IDs of products deleted after a token.\n
+    Mirrors call it again with next_token until has_more is false, then poll with the last one.\n
+    :param since: next_token of a previous call, omitted for a full sync.\n
+    :param limit: Max qty of changed products and of deleted IDs retrieved.\n
+    :return: ProductChangesResponseSchema response."""
+    try:
+        # On the primary: a lagging replica could miss rows older than the safety lag for good.
+        until = datetime.now(UTC) - timedelta(seconds=core_settings.CHANGE_FEED_SAFETY_LAG_SECONDS)
+        products, deleted, next_token, has_more = await product_crud.get_changes(
+            db=db, until=until, since=since, limit=limit
+        )
+
+        with timed("serialize"):
+            response = ProductChangesResponseSchema(
+                products=[ProductResponseSchema.model_validate(prod) for prod in products],
+                deleted=deleted,
+                next_token=next_token,
+                has_more=has_more
+                )
+        return model_response(response)
+
+    except AppException as exc:
+        raise exc
+
+
+@router.get("/search", response_model=ProductsResponseSchema)
+async def search_products(
+    q: Annotated[Optional[str], Query(min_length=1, max_length=50)] = None,
+    prefix: Annotated[Optional[str], Query(min_length=1, max_length=50)] = None,
+    brand: Optional[str] = None,
+    min_price: Annotated[Optional[float], Query(ge=0)] = None,
+    max_price: Annotated[Optional[float], Query(ge=0)] = None,
+    sort: ProductSortField = ProductSortField.NAME,
+    order: SortOrder = SortOrder.ASC,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=500)] = 100,
+    db: AsyncSession = Depends(get_read_db)
+) -> Response:
+    """Search products by name/brand text, brand and price range.\n
+    :param q: substring of name or brand.\n
+    :param prefix: beginning of name.\n
+    :param brand: exact brand.\n
+    :param min_price: lowest price included.\n
+    :param max_price: highest price included.\n
+    :param sort: name, price or created_at.\n
+    :param order: asc or desc.\n
+    :return: ProductsResponseSchema response."""
+    try:
+        products = await product_crud.search(
+            db=db, q=q, prefix=prefix, brand=brand,
+            min_price=min_price, max_price=max_price,
+            sort=sort, order=order, skip=offset, limit=limit
+        )
+        if not products:
+            raise NotFoundException(message="No products found.")
+
+        with timed("serialize"):
+            response = ProductsResponseSchema(
+                products=[ProductResponseSchema.model_validate(prod) for prod in products]
+                )
+        return model_response(response)
 
     except AppException as exc:
         raise exc
@@ -53,17 +225,30 @@ async def create_product(
 @router.get("/{product_id}", response_model=ProductResponseSchema)
 async def get_product(
     product_id: UUID,
-    db: AsyncSession = Depends(get_db)
-) -> ProductResponseSchema:
-    """Retrieve product by it's ID.\n
+    if_none_match: Annotated[Optional[str], Header()] = None,
+    db: AsyncSession = Depends(get_read_db)
+) -> Response:
+    """Retrieve product by it's ID, served from product cache when possible.\n
     :param product_id: productID.\n
-    :return: ProductResponseSchema response."""
+    :param if_none_match: ETag(s) already held by the client.\n
+    :return: ProductResponseSchema response, 304 when the client's copy is current."""
     try:
-        product = await product_crud.get(db=db, id=product_id)
-        if not product:
-            raise NotFoundException(message="Product not found.")
+        cached = product_cache.get(product_id)
+        if cached is None:
+            generation = product_cache.generation
+            product = await product_crud.get(db=db, id=product_id)
+            if not product:
+                raise NotFoundException(message="Product not found.")
+
+            # A replica row may already be stale, don't serve it longer than a replica may lag.
+            ttl = core_settings.DB_REPLICA_MAX_LAG_SECONDS if is_replica(db) else None
+            cached = product_cache.put(product, generation=generation, ttl=ttl)
+
+        headers = {"ETag": cached.etag}
+        if product_cache.etag_matches(if_none_match, cached.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-        return ProductResponseSchema.model_validate(product)
+        return Response(content=cached.body, media_type="application/json", headers=headers)
 
     except AppException as exc:
         raise exc
@@ -71,18 +256,25 @@ async def get_product(
 
 @router.get("/", response_model=ProductsResponseSchema)
 async def get_products(
-    db: AsyncSession = Depends(get_db)
-) -> ProductsResponseSchema:
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 100,
+    db: AsyncSession = Depends(get_read_db)
+) -> Response:
     """Retrieve products.\n
+    :param cursor: next_cursor value of a previous page.\n
+    :param limit: Qty of records to being retrieved.\n
     :return: ProductsResponseSchema response."""
     try:
-        products = await product_crud.get_multi(db=db)
+        products, next_cursor = await product_crud.get_page(db=db, cursor=cursor, limit=limit)
         if not products:
             raise NotFoundException(message="No products found.")
 
-        return ProductsResponseSchema(
-            products=[ProductResponseSchema.model_validate(prod) for prod in products]
-            )
+        with timed("serialize"):
+            response = ProductsResponseSchema(
+                products=[ProductResponseSchema.model_validate(prod) for prod in products],
+                next_cursor=next_cursor
+                )
+        return model_response(response)
 
     except AppException as exc:
         raise exc
@@ -95,31 +287,72 @@ async def update_product(
     current_user: currentUser,
     request: Request,
     background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db)
-) -> ProductResponseSchema:
+    db: AsyncSession = Depends(get_write_db)
+) -> Response:
     """Update product's info by it's ID.\n
     :param product_id: productID.\n
     :param product_in: ProductUpdateSchema input.\n
-    :return: ProductResponseSchema response."""
+    :return: ProductResponseSchema response, 409 when SKU or name belong to another product."""
     try:
-        db_product = await product_crud.get(db=db, id=product_id)
-        if not db_product:
+        updated_product = await product_crud.update_returning(
+            db=db, id=product_id, obj_in=product_in.model_dump(exclude_unset=True)
+        )
+        if not updated_product:
             raise NotFoundException(message="Product not found.")
 
-        if await product_crud.get_by_sku(sku=product_in.sku, db=db):
-            raise AlreadyExistException(message="Sky already exists.")
+        await AuditService.register(
+            current_user=current_user, request=request,
+            action=product_crud.update_returning, data=product_in.model_dump()
+            )
 
-        if await product_crud.get_by_name(name=product_in.name, db=db):
-            raise AlreadyExistException(message="Name already exists.")
+        background_tasks.add_task(
+            EmailService.notify_admin,
+            message=f"Product {product_id} has been updated by user {current_user.id}"
+            )
+
+        return model_response(
+            ProductResponseSchema.model_validate(updated_product),
+            headers={"ETag": product_cache.make_etag(updated_product)}
+        )
+
+    except AppException as exc:
+        raise exc
+
+
+@router.patch("/{product_id}", dependencies=[Depends(require_admin_user)], response_model=ProductResponseSchema)
+async def patch_product(
+    product_id: UUID,
+    product_in: ProductPatchSchema,
+    current_user: currentUser,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    if_match: Annotated[Optional[str], Header()] = None,
+    db: AsyncSession = Depends(get_write_db)
+) -> Response:
+    """Update the given fields of a product in a single statement.\n
+    :param product_id: productID.\n
+    :param product_in: ProductPatchSchema input, fields left out keep their value.\n
+    :param if_match: ETag of the copy the change is based on, the update is rejected if the product changed since.\n
+    :return: ProductResponseSchema response with the new ETag, 412 when the product changed since."""
+    try:
+        versions = None
+        if if_match is not None and if_match.strip() != "*":
+            versions = product_cache.parse_etags(if_match)
+            if not versions:
+                raise PreconditionFailedException(message="If-Match doesn't match the product's ETag.")
 
-        updated_product = await product_crud.update(
-            db=db,
-            db_obj=db_product,
-            obj_in=product_in.model_dump(exclude_unset=True)
+        updated_product = await product_crud.update_returning(
+            db=db, id=product_id, obj_in=product_in.model_dump(exclude_unset=True), expected_updated_at=versions
         )
+        if not updated_product:
+            # Only failures pay a second query, to tell a stale ETag from a missing product.
+            if versions is not None and await product_crud.get(db=db, id=product_id):
+                raise PreconditionFailedException(message="Product has been modified since it was read.")
+            raise NotFoundException(message="Product not found.")
+
         await AuditService.register(
-            current_user=current_user, db=db, request=request,
-            action=product_crud.update, data=product_in.model_dump()
+            current_user=current_user, request=request,
+            action=product_crud.update_returning, data=product_in.model_dump(exclude_unset=True)
             )
 
         background_tasks.add_task(
@@ -127,7 +360,10 @@ async def update_product(
             message=f"Product {product_id} has been updated by user {current_user.id}"
             )
 
-        return ProductResponseSchema.model_validate(updated_product)
+        return model_response(
+            ProductResponseSchema.model_validate(updated_product),
+            headers={"ETag": product_cache.make_etag(updated_product)}
+        )
 
     except AppException as exc:
         raise exc
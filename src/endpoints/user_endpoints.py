@@ -2,18 +2,18 @@
 from typing import Annotated, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud import user_crud
-from src.helpers.db import get_db
+from src.helpers.db import get_read_db, get_write_db
+from src.helpers.responses import model_response
 from src.middlewares.exceptions import (AlreadyExistException, AppException,
                                         NotFoundException)
-from src.models import User
 from src.schemas import (ListUserResponseSchema, UserCreateSchema,
                          UserResponseSchema, UserUpdateSchema)
 from src.services.audit import AuditService
-from src.services.auth import get_current_user
+from src.services.auth import Principal, get_current_user
 from src.services.auth.services import require_admin_user
 
 
@@ -25,7 +25,7 @@ router = APIRouter(
         Depends(get_current_user)
         ]
     )
-currentUser = Annotated[User, Depends(get_current_user)]
+currentUser = Annotated[Principal, Depends(get_current_user)]
 
 
 @router.post("/", response_model=UserResponseSchema)
@@ -33,8 +33,8 @@ async def create_user(
     user_in: UserCreateSchema,
     current_user: currentUser,
     request: Request,
-    db: AsyncSession = Depends(get_db)
-    ) -> UserResponseSchema:
+    db: AsyncSession = Depends(get_write_db)
+    ) -> Response:
     """Add new user if doesn't exist.\n
     :param user_in: UserCreateSchema schema input.\n
     :return: UserResponseSchema response."""
@@ -44,11 +44,11 @@ async def create_user(
 
         user = await user_crud.create(db=db, obj_in=user_in.model_dump(exclude_unset=True))
         await AuditService.register(
-            current_user=current_user, db=db, request=request,
+            current_user=current_user, request=request,
             action=user_crud.create, data=user_in.model_dump()
             )
 
-        return UserResponseSchema.model_validate(user)
+        return model_response(UserResponseSchema.model_validate(user))
 
     except AppException as exc:
         raise exc
@@ -57,24 +57,37 @@ async def create_user(
 @router.get("/", response_model=ListUserResponseSchema)
 async def get_users(
     offset: Optional[int] = 0,
-    limit: Optional[int] = 100,
-    db: AsyncSession = Depends(get_db)
-    ) -> ListUserResponseSchema:
+    limit: Annotated[int, Query(ge=1, le=500)] = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+    ) -> Response:
     """Retrieve all users.\n
+    Pages by keyset unless an offset is given; cursor takes precedence over offset.\n
     :param offset: Records to find starting from.\n
     :param limit: Qty of records to being retrieved.\n
+    :param cursor: next_cursor value of a previous page.\n
     :return: UserResponseSchema response."""
     try:
-        users = await user_crud.get_multi(db=db, skip=offset, limit=limit)
+        if offset and not cursor:
+            users = await user_crud.get_multi(db=db, skip=offset, limit=limit)
+            next_cursor = None
+            page = (offset // limit) + 1
+        else:
+            users, next_cursor = await user_crud.get_page(db=db, cursor=cursor, limit=limit)
+            page = None if cursor else 1
+
         if not users:
             raise NotFoundException(
                 message="Users not found."
             )
 
-        return ListUserResponseSchema(
-            user_data=users,
-            total=len(users),
-            page=(offset // limit) + 1 if limit else 1
+        return model_response(
+            ListUserResponseSchema(
+                user_data=users,
+                total=len(users),
+                page=page,
+                next_cursor=next_cursor
+            )
         )
 
     except AppException as exc:
@@ -84,8 +97,8 @@ async def get_users(
 @router.get("/{user_id}", response_model=UserResponseSchema)
 async def get_user(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db)
-    ) -> UserResponseSchema:
+    db: AsyncSession = Depends(get_read_db)
+    ) -> Response:
     """Retrieve an user.\n
     :param user_id: user identifier.\n
     :return: UserResponseSchema response."""
@@ -96,7 +109,7 @@ async def get_user(
                 message="User not found."
             )
 
-        return user
+        return model_response(UserResponseSchema.model_validate(user))
 
     except AppException as exc:
         raise exc
@@ -108,8 +121,8 @@ async def update_user(
     user_in: UserUpdateSchema,
     current_user: currentUser,
     request: Request,
-    db: AsyncSession = Depends(get_db)
-    ) -> UserResponseSchema:
+    db: AsyncSession = Depends(get_write_db)
+    ) -> Response:
     """Retrieve an user.\n
     :param user_id: user identifier.\n
     :param user_in: user data to update.\n
@@ -123,11 +136,11 @@ async def update_user(
 
         updated_user = await user_crud.update(db=db, db_obj=db_user, obj_in=user_in.model_dump(exclude_unset=True))
         await AuditService.register(
-            current_user=current_user, db=db, request=request,
+            current_user=current_user, request=request,
             action=user_crud.update, data=user_in.model_dump()
             )
 
-        return UserResponseSchema.model_validate(updated_user)
+        return model_response(UserResponseSchema.model_validate(updated_user))
 
     except AppException as exc:
         raise exc
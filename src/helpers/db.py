@@ -1,14 +1,18 @@
 """This module handle db async connection."""
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from src.database.database import async_session
+from src.database.database import async_engine, async_session
+from src.database.replicas import replica_pool
+from src.middlewares.consistency import read_your_writes
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Database session manager as context."""
-    async with async_session() as db:
+@asynccontextmanager
+async def _session(sessionmaker: async_sessionmaker) -> AsyncIterator[AsyncSession]:
+    async with sessionmaker() as db:
         try:
             yield db
 
@@ -18,3 +22,36 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise exc
         # finally:
         #     await db.close()
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Primary database session manager as context.\n
+    For reads that must never lag behind writes."""
+    async with _session(async_session) as db:
+        yield db
+
+
+async def get_write_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Primary database session manager as context, for requests that write.\n
+    The client's reads stay on the primary for DB_READ_YOUR_WRITES_SECONDS."""
+    read_your_writes.mark(request)
+    async with _session(async_session) as db:
+        yield db
+
+
+def read_sessionmaker(request: Request) -> async_sessionmaker:
+    """Sessionmaker of the next healthy replica for a read only request.\n
+    The primary one with no healthy replica or when the client has just written."""
+    replica = None if read_your_writes.is_recent(request) else replica_pool.choose()
+    return async_session if replica is None else replica.session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Read replica database session manager as context, for read only requests."""
+    async with _session(read_sessionmaker(request)) as db:
+        yield db
+
+
+def is_replica(db: AsyncSession) -> bool:
+    """Check whether a session reads from a replica, whose rows may lag behind."""
+    return db.bind is not async_engine
@@ -0,0 +1,75 @@
+"""This module handles opaque keyset (cursor) pagination tokens."""
+import base64
+import json
+import uuid
+from datetime import UTC, datetime
+from typing import Any, List, Optional, Tuple
+
+from src.middlewares.exceptions import BadRequestException
+
+
+Keyset = Tuple[datetime, uuid.UUID]
+
+# Position before any row, used for a change feed read from the beginning.
+ORIGIN: Keyset = (datetime(1970, 1, 1, tzinfo=UTC), uuid.UUID(int=0))
+
+
+def _encode(values: List[str]) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(token: str) -> List[Any]:
+    padded = token + "=" * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(obj: Any) -> str:
+    """Build an opaque cursor pointing right after the given row.\n
+    :param obj: SQLAlchemy model obj with created_at and id attributes.\n
+    :return: urlsafe base64 cursor string."""
+    return _encode([obj.created_at.isoformat(), str(obj.id)])
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Keyset]:
+    """Decode an opaque cursor into its (created_at, id) keyset position.\n
+    :param cursor: Cursor string previously returned as next_cursor.\n
+    :return: keyset tuple, None when no cursor was given."""
+    if not cursor:
+        return None
+
+    try:
+        created_at, obj_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), uuid.UUID(obj_id)
+
+    except (ValueError, TypeError) as exc:
+        raise BadRequestException(message="Invalid cursor.") from exc
+
+
+def encode_change_token(changed_after: Keyset, deleted_after: Keyset) -> str:
+    """Build an opaque change feed token.\n
+    :param changed_after: (updated_at, id) of the last change reported.\n
+    :param deleted_after: (created_at, id) of the last tombstone reported.\n
+    :return: urlsafe base64 token string."""
+    return _encode([
+        changed_after[0].isoformat(), str(changed_after[1]),
+        deleted_after[0].isoformat(), str(deleted_after[1]),
+    ])
+
+
+def decode_change_token(token: Optional[str]) -> Tuple[Keyset, Keyset]:
+    """Decode a change feed token into its changes and tombstones positions.\n
+    :param token: token previously returned as next_token, None to start from the beginning.\n
+    :return: (changed_after, deleted_after) keyset tuples."""
+    if not token:
+        return ORIGIN, ORIGIN
+
+    try:
+        changed_at, changed_id, deleted_at, deleted_id = _decode(token)
+        return (
+            (datetime.fromisoformat(changed_at), uuid.UUID(changed_id)),
+            (datetime.fromisoformat(deleted_at), uuid.UUID(deleted_id)),
+        )
+
+    except (ValueError, TypeError) as exc:
+        raise BadRequestException(message="Invalid change token.") from exc
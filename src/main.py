@@ -1,24 +1,111 @@
 """
 Module for the fastapi setup.
 """
-from typing import Any, Dict
+import asyncio
+import uuid
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from fastapi import FastAPI, responses, status
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.config.core import core_settings
+from src.database.database import async_engine
+from src.database.replicas import replica_pool
+from src.middlewares.consistency import ReadYourWritesMiddleware
 from src.middlewares.exceptions import (generic_exception_handler,
                                         http_exception_handler,
                                         sql_exception_handler,
                                         validation_request_exception_handler)
+from src.middlewares.idempotency import IdempotencyMiddleware
+from src.middlewares.metrics import MetricsMiddleware
+from src.middlewares.timing import ServerTimingMiddleware, instrument_engine
+from src.models import Product, User
 from src.routers import api_router, routes
+from src.services.audit import audit_purger, audit_writer
+from src.services.auth import password_hasher, token_versions
+from src.services.change_events import change_listener
+from src.services.email import EmailService
+from src.services.idempotency import idempotency_store
+from src.services.product_cache import product_cache
+from src.services.warmup import warm_up
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
 
 
-app = FastAPI(root_path="/catalog_api")
+logger = get_logger()
 
 
+async def log_pool_stats(interval: float) -> None:
+    """Periodically log db connection pool usage."""
+    while True:
+        await asyncio.sleep(interval)
+        logger.info(f"DB pool stats: {async_engine.pool.stats()}")
+
+
+def on_products_change(op: str, ids: Optional[List[uuid.UUID]]) -> None:
+    """Evict products another worker wrote."""
+    if ids is None:
+        product_cache.invalidate()
+        return
+    for product_id in ids:
+        product_cache.invalidate(product_id)
+
+
+def on_users_change(op: str, ids: Optional[List[uuid.UUID]]) -> None:
+    """Reload token versions and admin recipients of users another worker wrote."""
+    token_versions.invalidate(ids)
+    EmailService.invalidate_recipients()
+
+
+change_listener.subscribe(Product.__tablename__, on_products_change)
+change_listener.subscribe(User.__tablename__, on_users_change)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start background services on startup and drain them on shutdown."""
+    background_tasks = []
+    audit_writer.start()
+    audit_purger.start()
+    idempotency_store.start()
+    token_versions.start()
+    replica_pool.start()
+    # Listen before warming caches up, so no write slips between both.
+    await change_listener.start()
+    await warm_up()
+    if core_settings.DB_POOL_STATS_LOG_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(log_pool_stats(core_settings.DB_POOL_STATS_LOG_INTERVAL_SECONDS)))
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await change_listener.stop()
+    await token_versions.stop()
+    await replica_pool.stop()
+    await EmailService.stop()
+    await idempotency_store.stop()
+    await audit_purger.stop()
+    await audit_writer.stop()
+    password_hasher.shutdown()
+
+
+app = FastAPI(root_path="/catalog_api", lifespan=lifespan, default_response_class=ORJSONResponse)
+
+
+# Inside CORS, so replays get the CORS headers of the retry rather than of the first request.
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=idempotency_store,
+    max_body_bytes=core_settings.IDEMPOTENCY_MAX_RESPONSE_BYTES,
+    exclude_paths=("/authenthicate",),
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=core_settings.CORS_ORIGINS,
@@ -27,6 +114,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if core_settings.DB_REPLICA_URLS and core_settings.DB_READ_YOUR_WRITES_SECONDS > 0:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+if core_settings.SERVER_TIMING_ENABLED:
+    instrument_engine(async_engine)
+    for engine in replica_pool.engines:
+        instrument_engine(engine)
+    app.add_middleware(
+        ServerTimingMiddleware,
+        slow_request_threshold_ms=core_settings.SLOW_REQUEST_THRESHOLD_MS
+    )
+
+if core_settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, registry=metrics)
+    metrics.gauge("db_pool_size", "Connections kept open by the pool.", async_engine.pool.size)
+    metrics.gauge("db_pool_checked_out", "Connections in use.", async_engine.pool.checkedout)
+    metrics.gauge("db_pool_idle", "Connections idle in the pool.", async_engine.pool.checkedin)
+    metrics.gauge("db_pool_overflow", "Connections open above pool size.", lambda: max(async_engine.pool.overflow(), 0))
+    metrics.gauge("db_pool_checkout_timeouts", "Checkouts that timed out.", lambda: async_engine.pool.checkout_timeouts)
+    metrics.gauge("db_pool_wait_seconds_max", "Longest wait for a connection.", lambda: async_engine.pool.wait_time_max)
+    metrics.gauge("db_replicas_healthy", "Read replicas currently used.", lambda: replica_pool.healthy_count)
+    metrics.gauge("audit_backlog", "Audit rows waiting to be written.", lambda: audit_writer.backlog)
+    metrics.gauge("email_backlog", "Admin notifications waiting for the next digest.", EmailService.backlog)
+
 app.add_exception_handler(exc_class_or_status_code=HTTPException, handler=http_exception_handler)
 app.add_exception_handler(exc_class_or_status_code=Exception, handler=generic_exception_handler)
 app.add_exception_handler(exc_class_or_status_code=RequestValidationError, handler=validation_request_exception_handler)
@@ -44,3 +155,9 @@ def root_endpoint() -> Dict[str, Any]:
         },
         status_code=status.HTTP_200_OK
     )
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint() -> PlainTextResponse:
+    """Metrics in Prometheus text exposition format."""
+    return PlainTextResponse(content=metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,80 @@
+"""This module keeps a client's reads on the primary right after it writes."""
+import hashlib
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.core import core_settings
+from src.utils.cache import TTLCache
+
+
+COOKIE_NAME = "read_primary_until"
+STATE_KEY = "read_primary_until"
+
+
+class ReadYourWrites:
+    """Remembers clients that wrote during the last window seconds.\n
+    Replicas may lag behind the primary, so these clients read from the
+    primary until the window ends. A client is its bearer token (or its address
+    when anonymous) in this worker, and a cookie covers the other workers."""
+
+    def __init__(self, window: float, maxsize: int = 10000):
+        """:param window: seconds reads stay on the primary after a write, 0 disables.
+        :param maxsize: max qty of clients remembered by this worker."""
+        self.window = window
+        self._clients = TTLCache(maxsize=maxsize, ttl=window)
+
+    @staticmethod
+    def _client_key(conn: HTTPConnection) -> str:
+        authorization = conn.headers.get("authorization")
+        if authorization:
+            return hashlib.sha256(authorization.encode()).hexdigest()
+        return conn.client.host if conn.client else ""
+
+    def mark(self, conn: HTTPConnection) -> None:
+        """Record that the client of conn is writing."""
+        if self.window <= 0:
+            return
+        self._clients.set(self._client_key(conn), True)
+        conn.state.read_primary_until = time.time() + self.window
+
+    def is_recent(self, conn: HTTPConnection) -> bool:
+        """Check whether the client of conn wrote during the window."""
+        if self.window <= 0:
+            return False
+        try:
+            if float(conn.cookies.get(COOKIE_NAME, 0)) > time.time():
+                return True
+        except ValueError:
+            pass
+        return self._clients.get(self._client_key(conn), False)
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware setting the read_primary_until cookie on responses to
+    requests that wrote, so the client's next reads hit the primary on any worker."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                until = scope.get("state", {}).get(STATE_KEY)
+                if until is not None:
+                    max_age = max(int(until - time.time()) + 1, 1)
+                    MutableHeaders(scope=message).append(
+                        "Set-Cookie", f"{COOKIE_NAME}={until:.3f}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax"
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+read_your_writes = ReadYourWrites(window=core_settings.DB_READ_YOUR_WRITES_SECONDS)
@@ -1,4 +1,5 @@
 """This module handles various exceptions."""
+import math
 from datetime import UTC, datetime
 from typing import Any, Dict, Optional
 
@@ -18,6 +19,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
             "status_code": exc.status_code,
             "timestamp": datetime.now(tz=UTC).isoformat()
         },
+        headers=exc.headers,
     )
 
 
@@ -123,6 +125,19 @@ class NotFoundException(ApiException):
         super().__init__(status_code=status_code, detail=detail, message=message, headers=headers)
 
 
+class BadRequestException(ApiException):
+    """Malformed request data exception."""
+    def __init__(
+            self,
+            status_code: int = status.HTTP_400_BAD_REQUEST,
+            message: Optional[str] = "Bad request.",
+            detail: Any = None,
+            headers: Optional[Dict[str, Any]] = None
+            ):
+
+        super().__init__(status_code=status_code, detail=detail, message=message, headers=headers)
+
+
 class AlreadyExistException(ApiException):
     """Resource already exist exception."""
     def __init__(
@@ -134,3 +149,31 @@ class AlreadyExistException(ApiException):
             ):
 
         super().__init__(status_code=status_code, detail=detail, message=message, headers=headers)
+
+
+class PreconditionFailedException(ApiException):
+    """Conditional request precondition (e.g. If-Match) not met exception."""
+    def __init__(
+            self,
+            status_code: int = status.HTTP_412_PRECONDITION_FAILED,
+            message: Optional[str] = "Precondition failed.",
+            detail: Any = None,
+            headers: Optional[Dict[str, Any]] = None
+            ):
+
+        super().__init__(status_code=status_code, detail=detail, message=message, headers=headers)
+
+
+class TooManyRequestsException(ApiException):
+    """Rate limit exceeded exception, tells the client when to retry."""
+    def __init__(
+            self,
+            retry_after: float = 1.0,
+            status_code: int = status.HTTP_429_TOO_MANY_REQUESTS,
+            message: Optional[str] = "Too many requests.",
+            detail: Any = None,
+            headers: Optional[Dict[str, Any]] = None
+            ):
+
+        headers = {**(headers or {}), "Retry-After": str(max(math.ceil(retry_after), 1))}
+        super().__init__(status_code=status_code, detail=detail, message=message, headers=headers)
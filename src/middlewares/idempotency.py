@@ -0,0 +1,160 @@
+"""This module replays responses of write requests retried with the same Idempotency-Key."""
+import hashlib
+from typing import Iterable, List, Tuple
+
+from fastapi import status
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.middlewares.exceptions import ApiException, http_exception_handler
+from src.services.idempotency import IdempotencyStore, StoredResponse
+
+
+HEADER = "idempotency-key"
+MAX_KEY_LENGTH = 255
+# Per request headers of the first response that a replay must not repeat.
+UNSTORED_HEADERS = {b"set-cookie", b"server-timing", b"date"}
+# Outcomes that depend on the moment or the credentials rather than on the request, a retry runs again.
+UNSTORED_STATUSES = {
+    status.HTTP_401_UNAUTHORIZED,
+    status.HTTP_403_FORBIDDEN,
+    status.HTTP_408_REQUEST_TIMEOUT,
+    status.HTTP_429_TOO_MANY_REQUESTS,
+}
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware running write requests with an Idempotency-Key once.\n
+    A retry with the same key, credentials, method and path gets the first
+    response back (with Idempotent-Replayed: true) without reaching the
+    endpoint; one arriving while the first runs waits for it. Reusing a key
+    with a different body is answered 422; 5xx responses aren't stored."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: IdempotencyStore,
+        max_body_bytes: int,
+        methods: Iterable[str] = ("POST", "PUT", "PATCH"),
+        exclude_paths: Iterable[str] = (),
+    ):
+        """:param store: where keys and responses are kept.
+        :param max_body_bytes: larger responses aren't stored, their key is released.
+        :param methods: methods honoring the header.
+        :param exclude_paths: paths containing any of these ignore the header (e.g. login)."""
+        self.app = app
+        self.store = store
+        self.max_body_bytes = max_body_bytes
+        self.methods = set(methods)
+        self.exclude_paths = tuple(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
+        idempotency_key = request.headers.get(HEADER)
+        if idempotency_key is None or any(path in scope["path"] for path in self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            await self._error(request, send, status.HTTP_400_BAD_REQUEST, "Invalid Idempotency-Key.")
+            return
+
+        # Keys are scoped by credentials, a key never replays another client's response.
+        key = hashlib.sha256(
+            "\n".join(
+                [request.headers.get("authorization", ""), scope["method"], scope["path"], idempotency_key]
+            ).encode()
+        ).hexdigest()
+
+        while True:
+            claim = await self.store.claim(key)
+            if claim.owner:
+                await self._run(scope, receive, send, key)
+                return
+
+            stored = claim.stored or await self.store.wait(key)
+            if stored is not None:
+                await self._replay(request, send, stored)
+                return
+
+            if self.store.is_held(key):
+                await self._error(
+                    request, send, status.HTTP_409_CONFLICT,
+                    "A request with this Idempotency-Key is still being processed."
+                )
+                return
+            # The first request failed or its claim expired: claim the key again.
+
+    async def _run(self, scope: Scope, receive: Receive, send: Send, key: str) -> None:
+        """Run the request, hashing its body and capturing its response on the way."""
+        hasher = hashlib.sha256()
+        body_read = False
+        status_code = None
+        headers: List[Tuple[str, str]] = []
+        chunks: List[bytes] = []
+        size = 0
+
+        async def receive_hashing() -> Message:
+            nonlocal body_read
+            message = await receive()
+            if message["type"] == "http.request":
+                hasher.update(message.get("body", b""))
+                body_read = not message.get("more_body", False)
+            return message
+
+        async def send_capturing(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers.extend(
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                    if name.lower() not in UNSTORED_HEADERS
+                )
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                size += len(body)
+                if size <= self.max_body_bytes:
+                    chunks.append(body)
+            await send(message)
+
+        stored = None
+        try:
+            await self.app(scope, receive_hashing, send_capturing)
+            if (
+                status_code is not None and status_code < 500 and status_code not in UNSTORED_STATUSES
+                and size <= self.max_body_bytes
+            ):
+                stored = StoredResponse(
+                    fingerprint=hasher.hexdigest() if body_read else None,
+                    status_code=status_code, headers=headers, body=b"".join(chunks)
+                )
+        finally:
+            await self.store.complete(key, stored)
+
+    async def _replay(self, request: Request, send: Send, stored: StoredResponse) -> None:
+        """Send a stored response, once the body is checked to be the same as the first one."""
+        if stored.fingerprint is not None:
+            hasher = hashlib.sha256()
+            async for chunk in request.stream():
+                hasher.update(chunk)
+            if hasher.hexdigest() != stored.fingerprint:
+                await self._error(
+                    request, send, status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    "Idempotency-Key was already used with a different request body."
+                )
+                return
+
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in stored.headers]
+        headers.append((b"idempotent-replayed", b"true"))
+        await send({"type": "http.response.start", "status": stored.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": stored.body})
+
+    @staticmethod
+    async def _error(request: Request, send: Send, status_code: int, message: str) -> None:
+        response = await http_exception_handler(request, ApiException(status_code=status_code, message=message))
+        await response(request.scope, request.receive, send)
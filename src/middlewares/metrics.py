@@ -0,0 +1,47 @@
+"""This module records per-route request metrics."""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.metrics import MetricsRegistry
+
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting in-flight requests and recording status and
+    latency per route template (e.g. /api/v1/products/{product_id})."""
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        status_code = 500
+        started_at = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            registry.in_flight -= 1
+            # The router stores the matched APIRoute in scope.
+            route = scope.get("route")
+            if route is not None:
+                # APIRoute isn't hashable; routes live as long as the app, so id() is stable.
+                stats = registry.route_stats(id(route), scope["method"], route.path)
+            else:
+                stats = registry.route_stats(scope["method"], scope["method"], UNMATCHED_ROUTE)
+            stats.observe(status_code, time.perf_counter() - started_at)
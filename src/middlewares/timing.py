@@ -0,0 +1,135 @@
+"""This module measures where request time goes and reports it as Server-Timing."""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.core import core_settings
+from src.utils.logger import get_logger
+
+
+logger = get_logger()
+
+
+class RequestTimings:
+    """Time spent per phase and SQL statements run while handling a request."""
+    __slots__ = ("started_at", "phases", "db_count", "db_time", "statements")
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.db_count = 0
+        self.db_time = 0.0
+        self.statements: List[Tuple[str, float]] = []
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Accumulate seconds spent on phase."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the request started."""
+        return time.perf_counter() - self.started_at
+
+    def server_timing(self) -> str:
+        """Render timings as a Server-Timing header value."""
+        metrics = [f'db;dur={self.db_time * 1000:.2f};desc="{self.db_count} queries"']
+        metrics.extend(f"{phase};dur={seconds * 1000:.2f}" for phase, seconds in self.phases.items())
+        metrics.append(f"total;dur={self.elapsed * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Return timings of the request being handled, None outside a request."""
+    return _current_timings.get()
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the time spent inside the block to phase of the current request."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started_at)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info["query_started_at"].pop()
+    timings = _current_timings.get()
+    if timings is None:
+        return
+
+    duration = time.perf_counter() - started_at
+    timings.db_count += 1
+    timings.db_time += duration
+    if len(timings.statements) < core_settings.SLOW_REQUEST_MAX_STATEMENTS:
+        timings.statements.append((statement, duration))
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started_at"):
+        conn.info["query_started_at"].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Count and time every query run by engine for the request that issued it."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware adding a Server-Timing header and logging slow requests."""
+
+    def __init__(self, app: ASGIApp, slow_request_threshold_ms: float):
+        self.app = app
+        self.slow_request_threshold = slow_request_threshold_ms / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timings.reset(token)
+            if timings.elapsed >= self.slow_request_threshold:
+                self._log_slow_request(scope, timings)
+
+    @staticmethod
+    def _log_slow_request(scope: Scope, timings: RequestTimings) -> None:
+        statements = "\n".join(
+            f"  [{duration * 1000:.2f}ms] {statement}" for statement, duration in timings.statements
+        )
+        logger.warning(
+            f"Slow request {scope['method']} {scope['path']} took {timings.elapsed * 1000:.2f}ms "
+            f"({timings.server_timing()})\n{statements}"
+        )
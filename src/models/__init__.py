@@ -1,3 +1,5 @@
 from .audit import AuditLog
 from .product import Product
 from .user import User
+from .tombstone import Tombstone
+from .idempotency import IdempotencyKey
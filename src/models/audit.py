@@ -1,7 +1,7 @@
 """This module handle important activities along system."""
 from uuid import UUID
 
-from sqlalchemy import UUID, ForeignKey, String
+from sqlalchemy import UUID, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database.base import Base
@@ -12,8 +12,16 @@ class AuditLog(Base):
 
     # Check if this field would be neccesary after
     user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    action_performed: Mapped[str] = mapped_column(String(20), nullable=False)
+    action_performed: Mapped[str] = mapped_column(String(100), nullable=False)
     # Pending extract module's name instead being just str
     affected_module: Mapped[str] = mapped_column(String(100), nullable=False)
     ip_address: Mapped[str] = mapped_column(String(50), nullable=False)
     user_agent: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    # Newest first keyset paging, alone or by each filter; created_at alone also serves retention purges.
+    __table_args__ = (
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        Index("ix_audit_logs_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_audit_logs_affected_module_created_at_id", "affected_module", "created_at", "id"),
+        Index("ix_audit_logs_action_performed_created_at_id", "action_performed", "created_at", "id"),
+    )
@@ -0,0 +1,22 @@
+"""This module keeps responses of write requests by their Idempotency-Key."""
+from datetime import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.base import Base
+
+
+class IdempotencyKey(Base):
+    """IdempotencyKey SQLAlchemy Model, status_code is NULL while the first request runs."""
+
+    # sha256 of the client's credentials, the method, the path and its Idempotency-Key.
+    key: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    # sha256 of the request body, NULL when the endpoint didn't read it whole.
+    fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    headers: Mapped[Optional[List[Any]]] = mapped_column(JSONB, nullable=True)
+    body: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Float, String
+from sqlalchemy import Float, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.database.base import Base
@@ -25,3 +25,15 @@ class Product(Base):
         String(50),
         nullable=False,
     )
+
+    __table_args__ = (
+        # Keyset paging on (created_at, id).
+        Index("ix_products_created_at_id", "created_at", "id"),
+        # Search: ILIKE on name and brand, brand equality and price ranges.
+        Index("ix_products_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_products_brand_trgm", "brand", postgresql_using="gin", postgresql_ops={"brand": "gin_trgm_ops"}),
+        Index("ix_products_brand_price", "brand", "price"),
+        Index("ix_products_price", "price"),
+        # Change feed keyset on (updated_at, id).
+        Index("ix_products_updated_at_id", "updated_at", "id"),
+    )
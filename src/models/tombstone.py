@@ -0,0 +1,18 @@
+"""This module keeps a record of deleted rows for change feeds."""
+from uuid import UUID
+
+from sqlalchemy import UUID, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.base import Base
+
+
+class Tombstone(Base):
+    """Tombstone SQLAlchemy Model, created_at is the deletion time."""
+
+    table_name: Mapped[str] = mapped_column(String(63), nullable=False)
+    record_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_tombstones_table_name_created_at_id", "table_name", "created_at", "id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.database.base import Base
@@ -21,5 +21,17 @@ class User(Base):
     user_type: Mapped[str] = mapped_column(
         String(50),
         nullable=False,
+        index=True,
         default=UserType.ANONYMOUS.value
     )
+    token_version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+
+    # Keyset paging on (created_at, id).
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
@@ -2,7 +2,8 @@
 from fastapi import APIRouter
 from fastapi.routing import APIRoute
 
-from src.endpoints import auth_router, product_router, user_router
+from src.endpoints import (admin_router, audit_router, auth_router,
+                           product_router, user_router)
 
 api_router = APIRouter(
     prefix="/api/v1",
@@ -11,6 +12,8 @@ api_router = APIRouter(
 api_router.include_router(auth_router)
 api_router.include_router(product_router)
 api_router.include_router(user_router)
+api_router.include_router(admin_router)
+api_router.include_router(audit_router)
 
 
 routes = {}
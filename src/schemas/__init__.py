@@ -1,5 +1,11 @@
+from .admin_schema import PoolStatsResponseSchema
+from .audit_schema import AuditLogResponseSchema, AuditLogsResponseSchema
 from .auth_schema import TokenResponse, UserAuthSchema
-from .product_schema import (ProductCreateSchema, ProductResponseSchema,
+from .product_schema import (ProductChangesResponseSchema, ProductCreateSchema,
+                             ProductImportResponseSchema,
+                             ProductImportRowSchema, ProductLookupItemSchema,
+                             ProductLookupResponseSchema, ProductLookupSchema,
+                             ProductPatchSchema, ProductResponseSchema,
                              ProductsResponseSchema, ProductUpdateSchema)
 from .user_schema import (ListUserResponseSchema, UserCreateSchema,
                           UserResponseSchema, UserUpdateSchema)
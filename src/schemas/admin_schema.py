@@ -0,0 +1,15 @@
+"""This module handles admin/diagnostics schemas."""
+from pydantic import BaseModel
+
+
+class PoolStatsResponseSchema(BaseModel):
+    """A schema class for db connection pool usage."""
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    checkout_timeouts: int
+    wait_time_avg_ms: float
+    wait_time_max_ms: float
@@ -0,0 +1,27 @@
+"""This module handles audit log schemas."""
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class AuditLogResponseSchema(BaseModel):
+    """A schema class for an audit log response."""
+    id: UUID
+    user_id: UUID
+    action_performed: str
+    affected_module: str
+    ip_address: str
+    user_agent: str
+    created_at: datetime
+
+    class Config:
+        """SQLalchemy pydantic config class."""
+        from_attributes = True
+
+
+class AuditLogsResponseSchema(BaseModel):
+    """A schema class for audit logs response, newest first."""
+    audit_logs: List[AuditLogResponseSchema]
+    next_cursor: Optional[str] = None
@@ -1,9 +1,12 @@
 """This module handle all Product related pydantic schemas."""
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, PositiveFloat
+from pydantic import BaseModel, Field, PositiveFloat, model_validator
+
+from src.config.core import core_settings
+from src.utils.enumerators import ImportRowStatus
 
 
 class ProductBaseSchema(BaseModel):
@@ -21,6 +24,23 @@ class ProductUpdateSchema(ProductBaseSchema):
     """A schema class representing response for product."""
 
 
+class ProductPatchSchema(BaseModel):
+    """A schema class for a partial product update, only given fields change."""
+    sku: Optional[str] = Field(default=None, examples=["PROD-0001"])
+    name: Optional[str] = Field(default=None, examples=["Your Product Name."])
+    price: Optional[PositiveFloat] = None
+    brand: Optional[str] = Field(default=None, examples=["Your Recognized Brand."])
+
+    @model_validator(mode="after")
+    def check_fields(self) -> "ProductPatchSchema":
+        """Check at least one field is given and none is null."""
+        if not self.model_fields_set:
+            raise ValueError("At least one field must be given.")
+        if any(getattr(self, field) is None for field in self.model_fields_set):
+            raise ValueError("Fields can't be null.")
+        return self
+
+
 class ProductResponseSchema(ProductBaseSchema):
     """A schema class for product response."""
     id: UUID
@@ -34,3 +54,59 @@ class ProductResponseSchema(ProductBaseSchema):
 class ProductsResponseSchema(BaseModel):
     """A schema class products response."""
     products: List[ProductResponseSchema]
+    next_cursor: Optional[str] = None
+
+
+class ProductLookupSchema(BaseModel):
+    """A schema class for products lookup by IDs or by SKUs."""
+    ids: Optional[List[UUID]] = Field(default=None, max_length=core_settings.PRODUCT_LOOKUP_MAX_ITEMS)
+    skus: Optional[List[str]] = Field(
+        default=None, max_length=core_settings.PRODUCT_LOOKUP_MAX_ITEMS, examples=[["PROD-0001", "PROD-0002"]]
+    )
+
+    @model_validator(mode="after")
+    def check_one_key_kind(self) -> "ProductLookupSchema":
+        """Check exactly one of ids or skus is given."""
+        if (self.ids is None) == (self.skus is None):
+            raise ValueError("Either ids or skus must be given, not both.")
+        return self
+
+
+class ProductLookupItemSchema(BaseModel):
+    """A schema class for the outcome of one looked up ID or SKU."""
+    key: str
+    found: bool
+    product: Optional[ProductResponseSchema] = None
+
+
+class ProductLookupResponseSchema(BaseModel):
+    """A schema class for products lookup response, results keep request order."""
+    results: List[ProductLookupItemSchema]
+    found: int
+    missing: int
+
+
+class ProductChangesResponseSchema(BaseModel):
+    """A schema class for products change feed response."""
+    products: List[ProductResponseSchema]
+    deleted: List[UUID]
+    next_token: str
+    has_more: bool
+
+
+class ProductImportRowSchema(BaseModel):
+    """A schema class for the outcome of one bulk import row."""
+    row: int
+    sku: Optional[str] = None
+    status: ImportRowStatus
+    id: Optional[UUID] = None
+    errors: List[str] = Field(default_factory=list)
+
+
+class ProductImportResponseSchema(BaseModel):
+    """A schema class for bulk import report."""
+    total: int
+    created: int
+    updated: int
+    failed: int
+    results: List[ProductImportRowSchema]
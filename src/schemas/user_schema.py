@@ -4,7 +4,7 @@ from typing import Optional, List
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
-from src.services.auth import get_password_hash, is_valid_password
+from src.services.auth import is_valid_password
 from src.utils.enumerators import UserType
 
 
@@ -35,13 +35,6 @@ class UserUpdateSchema(UserCreateSchema):
     password: Optional[str] = Field(default=None, examples=["MyPassword456#"])
     user_type: Optional[UserType] = Field(default=None, examples=[UserType.ADMIN.value, UserType.ANONYMOUS.value])
 
-    @field_validator("password")
-    @classmethod
-    def hash_password(cls, value) -> str:
-        """Hash password if comes in schema data."""
-        value = get_password_hash(plain_password=value)
-        return value
-
     @field_validator("user_type")
     @classmethod
     def extract_value(cls, enum_class) -> str:
@@ -64,4 +57,5 @@ class ListUserResponseSchema(BaseModel):
     """A schema class for user list response."""
     user_data: List[UserResponseSchema]
     total: int
-    page: int
+    page: Optional[int] = None
+    next_cursor: Optional[str] = None
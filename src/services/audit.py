@@ -1,45 +1,246 @@
 """This module tries to audit actions."""
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import Any, Dict, List, Optional
 
 from fastapi import Request
+from sqlalchemy import insert
 
+from src.config.core import core_settings
+from src.crud import audit_crud
+from src.database.database import async_session
 from src.models import AuditLog
 from src.utils.logger import get_logger
 
 
 logger = get_logger()
 
+# Column lengths of audit_logs, longer values are truncated rather than failing the batch INSERT.
+IP_ADDRESS_LENGTH = 50
+USER_AGENT_LENGTH = 255
+
+
+class AuditWriter:
+    """Background audit pipeline.\n
+    Requests enqueue rows; a single flusher bulk-INSERTs them once the batch
+    is full or the flush interval elapses. A bounded queue gives backpressure."""
+
+    def __init__(self, maxsize: int, batch_size: int, flush_interval: float, enqueue_timeout: float):
+        """:param maxsize: max rows waiting in queue.
+        :param batch_size: max rows per INSERT.
+        :param flush_interval: max seconds a row waits before being written.
+        :param enqueue_timeout: seconds to wait for room in a full queue."""
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def backlog(self) -> int:
+        """Qty of rows waiting to be flushed."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Start the flusher task on the running loop if it isn't running."""
+        if self._task is not None and not self._task.done():
+            return
+
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = asyncio.create_task(self._run(), name="audit-writer")
+
+    async def enqueue(self, row: Dict[str, Any]) -> None:
+        """Queue a row, waiting at most enqueue_timeout when the queue is full."""
+        self.start()
+        try:
+            await asyncio.wait_for(self._queue.put(row), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Audit queue is full, dropping row. {row}")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Wait for queued rows to be flushed, then stop the flusher.\n
+        :param timeout: max seconds to wait for the flusher to drain the queue."""
+        if self._task is None:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Audit queue not drained in {timeout}s, flushing the remaining rows directly.")
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        while not self._queue.empty():
+            rows = self._drain(self.batch_size)
+            await self._flush(rows)
+            self._done(len(rows))
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        """Pop up to limit rows without waiting."""
+        rows = []
+        while len(rows) < limit and not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+        return rows
+
+    def _done(self, qty: int) -> None:
+        """Mark qty rows as processed so queue.join() can return."""
+        for _ in range(qty):
+            self._queue.task_done()
+
+    async def _run(self) -> None:
+        """Collect rows until the batch is full or the interval is over, then flush."""
+        loop = asyncio.get_running_loop()
+        while True:
+            rows = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(rows) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    rows.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._flush(rows)
+            self._done(len(rows))
+
+    async def _flush(self, rows: List[Dict[str, Any]]) -> None:
+        """Write rows with a single multi-row INSERT in its own transaction.
+        When it is rejected, retry each half so one bad row loses only itself."""
+        if not rows:
+            return
+
+        try:
+            async with async_session() as db:
+                await db.execute(insert(AuditLog), rows)
+                await db.commit()
+
+        except Exception as e:
+            if len(rows) == 1:
+                logger.error(f"An unexpected error flushing an audit log has occurred. {rows[0]} {e}")
+                return
+
+            middle = len(rows) // 2
+            await self._flush(rows[:middle])
+            await self._flush(rows[middle:])
+
+
+audit_writer = AuditWriter(
+    maxsize=core_settings.AUDIT_QUEUE_MAXSIZE,
+    batch_size=core_settings.AUDIT_BATCH_SIZE,
+    flush_interval=core_settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    enqueue_timeout=core_settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS,
+)
+
+
+class AuditPurger:
+    """Background retention job deleting audit logs older than retention_days.\n
+    Rows go in small batches, each in its own short transaction with a pause
+    in between, so a purge never holds locks or bloats WAL for long."""
+
+    def __init__(self, retention_days: float, batch_size: int, interval: float, batch_pause: float):
+        """:param retention_days: days audit logs are kept, 0 keeps them forever.
+        :param batch_size: max rows deleted per transaction.
+        :param interval: seconds between purge runs.
+        :param batch_pause: seconds to sleep between batches."""
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self.batch_pause = batch_pause
+        self._task: Optional[asyncio.Task] = None
+
+    async def purge(self) -> int:
+        """Delete every expired audit log, batch by batch.\n
+        :return: qty of logs deleted."""
+        before = datetime.now(UTC) - timedelta(days=self.retention_days)
+        purged = 0
+        while True:
+            async with async_session() as db:
+                deleted = await audit_crud.purge_batch(db=db, before=before, batch_size=self.batch_size)
+            if deleted is None:
+                logger.info("Audit logs are being purged by another worker.")
+                break
+
+            purged += deleted
+            if deleted < self.batch_size:
+                break
+            await asyncio.sleep(self.batch_pause)
+
+        if purged:
+            logger.info(f"Purged {purged} audit logs created before {before.isoformat()}.")
+        return purged
+
+    def start(self) -> None:
+        """Start the purge task on the running loop if retention is set and it isn't running."""
+        if self.retention_days <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="audit-purger")
+
+    async def stop(self) -> None:
+        """Stop the purge task, a batch being deleted is rolled back."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.purge()
+            except Exception as e:
+                logger.error(f"An unexpected error purging audit logs has occurred. {e}")
+            await asyncio.sleep(self.interval)
+
+
+audit_purger = AuditPurger(
+    retention_days=core_settings.AUDIT_RETENTION_DAYS,
+    batch_size=core_settings.AUDIT_PURGE_BATCH_SIZE,
+    interval=core_settings.AUDIT_PURGE_INTERVAL_SECONDS,
+    batch_pause=core_settings.AUDIT_PURGE_BATCH_PAUSE_SECONDS,
+)
+
 
 class AuditService:
     """Audition logging service."""
 
     @staticmethod
     async def register(*args, **kwargs) -> None:
-        """Register actions completed from endpoint and store them.\n
+        """Register actions completed from endpoint and queue them to be stored.\n
         :Arg user: user db obj.
-        :Arg db: Async db connection.
         :Arg req: Request object.
         :Arg action: Main action func performed to been tracked.
         :Arg data[optional]: Any data to being store or changed in db.
         """
         try:
             user = kwargs.get("current_user")
-            db = kwargs.get("db")
             req: Request = kwargs.get("request")
             action = kwargs.get("action")
-            data = kwargs.get("data")
 
+            # Only the first hop of X-Forwarded-For is the client.
+            forwarded_for = (req.headers.get("X-Forwarded-For") or "").split(",")[0].strip()
             obj_data = {
                 "user_id": user.id or None,
                 "action_performed":action.__qualname__,
                 "affected_module":action.__self__.__class__.__name__,
-                "ip_address":req.headers.get("X-Forwarded-For") or req.client.host,
-                "user_agent":req.headers.get("user-agent"),
+                "ip_address":(forwarded_for or (req.client.host if req.client else "unknown"))[:IP_ADDRESS_LENGTH],
+                "user_agent":(req.headers.get("user-agent") or "")[:USER_AGENT_LENGTH],
             }
 
-            audit_obj = AuditLog(**obj_data)
-
-            db.add(audit_obj)
-            await db.commit()
+            await audit_writer.enqueue(obj_data)
 
         except Exception as e:
             logger.error(f"An unexpected error handling logs has occurred. {e}")
@@ -1 +1,5 @@
-from .services import generate_token, validate_token, is_valid_password, verify_password, get_current_user, get_password_hash
+from .services import generate_token, validate_token, is_valid_password, get_current_user
+from .hashing import password_hasher
+from .throttling import login_throttle
+from .principal import Principal
+from .versions import token_versions
@@ -0,0 +1,44 @@
+"""This module caches decoded token claims."""
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+from src.utils.cache import TTLCache
+
+from .settings import AUTHSETTINGS
+
+
+class PrincipalCache:
+    """Caches verified JWT claims by token hash, so a token's signature is checked once."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        """:param maxsize: max qty of tokens kept.
+        :param ttl: seconds an entry may be served without decoding the token again."""
+        self.ttl = ttl
+        self._claims = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        """Hash the raw token so credentials aren't kept in memory as keys."""
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get_claims(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return cached claims of a token already verified."""
+        return self._claims.get(self._token_key(token))
+
+    def set_claims(self, token: str, claims: Dict[str, Any]) -> None:
+        """Store verified claims, never past the token expiration."""
+        ttl = self.ttl
+        if claims.get("exp") is not None:
+            ttl = min(ttl, float(claims["exp"]) - time.time())
+        self._claims.set(self._token_key(token), claims, ttl=ttl)
+
+    def clear(self) -> None:
+        """Drop every cached claim."""
+        self._claims.clear()
+
+
+principal_cache = PrincipalCache(
+    maxsize=AUTHSETTINGS.PRINCIPAL_CACHE_MAXSIZE,
+    ttl=AUTHSETTINGS.PRINCIPAL_CACHE_TTL_SECONDS
+)
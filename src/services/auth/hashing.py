@@ -0,0 +1,104 @@
+"""This module runs bcrypt hashing and verification off the event loop."""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
+
+from src.middlewares.timing import timed
+from src.utils.metrics import bcrypt_queue_seconds
+
+from .settings import AUTHSETTINGS
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+T = TypeVar("T")
+
+_pwd_context: Optional["CryptContext"] = None
+
+
+def get_pwd_context() -> "CryptContext":
+    """Return the bcrypt passlib context, imported and built on first use."""
+    global _pwd_context  # pylint: disable=global-statement
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        _pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+    return _pwd_context
+
+
+class PasswordHasher:
+    """Async bcrypt service backed by a bounded thread pool.\n
+    bcrypt releases the GIL, so threads give real parallelism while the
+    semaphore caps how many hashes may be queued or running at once."""
+
+    def __init__(self, max_workers: int, max_concurrency: int):
+        """:param max_workers: threads dedicated to bcrypt.
+        :param max_concurrency: max hash/verify calls admitted at the same time."""
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        with timed("bcrypt"):
+            queued_at = time.perf_counter()
+            async with self._get_semaphore():
+                loop = asyncio.get_running_loop()
+                started_at, result = await loop.run_in_executor(self._get_executor(), self._call, func, args)
+            bcrypt_queue_seconds.observe(started_at - queued_at)
+            return result
+
+    @staticmethod
+    def _call(func: Callable[..., T], args: tuple):
+        """Run func in a worker thread, returning when it actually started."""
+        return time.perf_counter(), func(*args)
+
+    async def hash(self, plain_password: str) -> str:
+        """Generate hash from plain text password.\n
+        :param plain_password: Plain text password to hash.\n
+        :return: Hashed password string."""
+        return await self._run(get_pwd_context().hash, plain_password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify plain password against hashed password.\n
+        :param plain_password: Plain text password to verify.\n
+        :param hashed_password: Hashed password from database.\n
+        :return: True if passwords match, False otherwise."""
+        return await self._run(get_pwd_context().verify, plain_password, hashed_password)
+
+    async def warm_up(self) -> None:
+        """Import passlib and load its bcrypt backend in a worker thread, ahead of the first login."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._get_executor(), self._load_backend)
+
+    @staticmethod
+    def _load_backend() -> None:
+        get_pwd_context().handler("bcrypt").get_backend()
+
+    def shutdown(self) -> None:
+        """Release the worker threads, they are created again on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        # Bound to the loop being closed.
+        self._semaphore = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=AUTHSETTINGS.HASH_WORKERS,
+    max_concurrency=AUTHSETTINGS.HASH_MAX_CONCURRENCY
+)
@@ -0,0 +1,30 @@
+"""This module defines the authenticated user as stated by its token."""
+import uuid
+from typing import Any, Dict, NamedTuple
+
+
+class Principal(NamedTuple):
+    """Authenticated user built from verified token claims, no db row behind it."""
+    id: uuid.UUID
+    email: str
+    user_type: str
+    token_version: int
+
+    @classmethod
+    def from_claims(cls, claims: Dict[str, Any]) -> "Principal":
+        """Build a principal from token claims, KeyError/ValueError when any is missing or malformed."""
+        return cls(
+            id=uuid.UUID(claims["id"]),
+            email=claims["email"],
+            user_type=claims["role"],
+            token_version=int(claims["ver"]),
+        )
+
+    def to_claims(self) -> Dict[str, Any]:
+        """Claims to issue a token for this principal."""
+        return {
+            "id": str(self.id),
+            "email": self.email,
+            "role": self.user_type,
+            "ver": self.token_version,
+        }
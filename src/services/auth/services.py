@@ -7,18 +7,20 @@ from fastapi import Depends, HTTPException, Security, status
 from fastapi.responses import JSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import exceptions, jwt
-from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import defer
 
 from src import models
-from src.helpers.db import get_db
+from src.middlewares.timing import timed
 from src.utils.enumerators import UserType
 
+from .cache import principal_cache
+from .hashing import password_hasher
+from .principal import Principal
 from .settings import AUTHSETTINGS
+from .throttling import login_throttle
+from .versions import token_versions
 
-pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 AUTH_SECRET_KEY = AUTHSETTINGS.SECRET_KEY
 AUTH_ALGORITHM = AUTHSETTINGS.ALGORITHM
 AUTH_ACCESS_TOKEN_EXPIRE_MINUTES = AUTHSETTINGS.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -34,68 +36,56 @@ def is_valid_password(password: str) -> Any:
     return re.fullmatch(regex, password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify plain password against hashed password.
-    :param plain_password: Plain text password to verify.
-    :param hashed_password: Hashed password from database.
-    :return: True if passwords match, False otherwise."""
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(plain_password: str) -> str:
-    """Generate hash from plain text password.\n
-    :param plain_password: Plain text password to hash.\n
-    :return: Hashed password string."""
-    return pwd_context.hash(plain_password)
-
-
 async def authenticate_user(email: str, password: str, db: AsyncSession) -> models.User | bool:
     """Authenticate user by email and password validation.\n
     :param email: User email address.\n
     :param password: Plain text password.\n
     :param db: Async database session.\n
     :return: User object if credentials are valid, False otherwise."""
-    result = await db.execute(select(models.User).where(models.User.email == email))
-    user = result.scalar_one_or_none()
     stmt = select(models.User).where(models.User.email == email)
     user = await db.scalar(stmt)
 
     if user:
-        return user if verify_password(password, user.password) else False
+        async with login_throttle.verification():
+            return user if await password_hasher.verify(password, user.password) else False
     return False
 
 
 async def get_current_user(
-    db: AsyncSession = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(HTTPBearer())
-) -> models.User:
-    """Extract and validate current user from JWT token.\n
-    :param db: Async database session dependency.\n
+) -> Principal:
+    """Extract and validate current user from JWT token claims.\n
+    No user row is read: identity and role come from the signed claims and
+    only the token version is checked against the (cached) current one.\n
     :param credentials: HTTP Bearer token credentials.\n
-    :return: Authenticated user object."""
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(token, AUTH_SECRET_KEY, algorithms=[AUTH_ALGORITHM])
-        user_email = payload.get("email")
+    :return: Authenticated principal."""
+    with timed("auth"):
+        return await _resolve_current_user(token=credentials.credentials)
 
-        if user_email is None:
+
+async def _resolve_current_user(token: str) -> Principal:
+    """Resolve the principal of a JWT token, decoding it only once while cached."""
+    try:
+        payload = principal_cache.get_claims(token)
+        if payload is None:
+            payload = jwt.decode(token, AUTH_SECRET_KEY, algorithms=[AUTH_ALGORITHM])
+            principal_cache.set_claims(token, payload)
+
+        try:
+            principal = Principal.from_claims(payload)
+        except (KeyError, TypeError, ValueError) as exc:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials"
-            )
+            ) from exc
 
-        stmt = select(models.User).options(
-            defer(models.User.password)
-            ).where(models.User.email == user_email)
-        user = await db.scalar(stmt)
-
-        if user is None:
+        if not await token_versions.is_current(principal.id, principal.token_version):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
+                detail="Token has been revoked, please log in again."
             )
 
-        return user
+        return principal
 
     except exceptions.JWTError as exc:
         raise HTTPException(
@@ -129,12 +119,13 @@ async def generate_token(db: AsyncSession, email: str, password: str) -> str:
 
     if db_user:
         access_token_expires = timedelta(minutes=AUTH_ACCESS_TOKEN_EXPIRE_MINUTES)
-        payload = {
-            "id": str(db_user.id),  # type: ignore
-            "email": str(db_user.email)  # type: ignore
-        }
+        principal = Principal(
+            id=db_user.id, email=db_user.email,
+            user_type=db_user.user_type, token_version=db_user.token_version
+        )
+        token_versions.set(principal.id, principal.token_version)
 
-        return create_access_token(data=payload, expires_delta=access_token_expires)
+        return create_access_token(data=principal.to_claims(), expires_delta=access_token_expires)
 
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -161,8 +152,8 @@ async def validate_token(token: str) -> None:
         )
 
 
-async def require_admin_user(current_user: models.User = Depends(get_current_user)) -> None:
-    """Require authenticated user to have admin privileges.
+async def require_admin_user(current_user: Principal = Depends(get_current_user)) -> None:
+    """Require authenticated user to have admin privileges, decided from token claims alone.
     :param current_user: Current authenticated user dependency.
     :return: User object if admin, raises exception otherwise."""
     if current_user.user_type != UserType.ADMIN.value:
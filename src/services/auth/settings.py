@@ -6,6 +6,21 @@ class AuthSettings:
     SECRET_KEY = os.getenv('AUTH_SECRET_KEY')
     ALGORITHM = os.getenv('AUTH_ALGORITHM')
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('AUTH_ACCESS_TOKEN_EXPIRE_MINUTES'))
+    PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv('AUTH_PRINCIPAL_CACHE_TTL_SECONDS', '60'))
+    PRINCIPAL_CACHE_MAXSIZE = int(os.getenv('AUTH_PRINCIPAL_CACHE_MAXSIZE', '10000'))
+    TOKEN_VERSION_REFRESH_SECONDS = float(os.getenv('AUTH_TOKEN_VERSION_REFRESH_SECONDS', '5'))
+    HASH_WORKERS = int(os.getenv('AUTH_HASH_WORKERS', str(min(4, os.cpu_count() or 1))))
+    HASH_MAX_CONCURRENCY = int(os.getenv('AUTH_HASH_MAX_CONCURRENCY', '32'))
+    LOGIN_IP_BURST = int(os.getenv('AUTH_LOGIN_IP_BURST', '20'))
+    LOGIN_IP_PER_MINUTE = float(os.getenv('AUTH_LOGIN_IP_PER_MINUTE', '10'))
+    LOGIN_EMAIL_BURST = int(os.getenv('AUTH_LOGIN_EMAIL_BURST', '5'))
+    LOGIN_EMAIL_PER_MINUTE = float(os.getenv('AUTH_LOGIN_EMAIL_PER_MINUTE', '5'))
+    LOGIN_MAX_CONCURRENT_VERIFICATIONS = int(
+        os.getenv('AUTH_LOGIN_MAX_CONCURRENT_VERIFICATIONS', os.getenv('AUTH_HASH_MAX_CONCURRENCY', '32'))
+    )
+    LOGIN_TRUST_FORWARDED_FOR = os.getenv('AUTH_LOGIN_TRUST_FORWARDED_FOR', 'false').lower() == 'true'
+    LOGIN_THROTTLE_STORE_URL = os.getenv('AUTH_LOGIN_THROTTLE_STORE_URL', '')
+    LOGIN_THROTTLE_MAX_KEYS = int(os.getenv('AUTH_LOGIN_THROTTLE_MAX_KEYS', '100000'))
 
 
 AUTHSETTINGS = AuthSettings
@@ -0,0 +1,184 @@
+"""This module throttles login attempts before they reach bcrypt."""
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+
+from src.middlewares.exceptions import TooManyRequestsException
+from src.utils.cache import TTLCache
+from src.utils.logger import get_logger
+
+from .settings import AUTHSETTINGS
+
+
+logger = get_logger()
+
+
+class ThrottleStore(ABC):
+    """Where token buckets live, shared by every worker using the same store."""
+
+    @abstractmethod
+    async def take(self, key: str, capacity: int, per_second: float) -> float:
+        """Take one token from the bucket of key.\n
+        :param key: bucket identifier.
+        :param capacity: max tokens a bucket holds, i.e. burst size.
+        :param per_second: tokens added back per second.
+        :return: 0 when a token was taken, else seconds until one is available."""
+
+
+class MemoryThrottleStore(ThrottleStore):
+    """Token buckets of this worker only."""
+
+    def __init__(self, max_keys: int, timer=time.monotonic):
+        """:param max_keys: max qty of buckets kept, least recently used ones are dropped.
+        :param timer: monotonic clock."""
+        # An expired bucket is as good as a full one, so entries only live until refilled.
+        self._buckets = TTLCache(maxsize=max_keys, ttl=0, timer=timer)
+        self._timer = timer
+
+    async def take(self, key: str, capacity: int, per_second: float) -> float:
+        now = self._timer()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * per_second)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / per_second
+
+        self._buckets.set(key, (tokens, now), ttl=(capacity - tokens) / per_second)
+        return retry_after
+
+
+class RedisThrottleStore(ThrottleStore):
+    """Token buckets in a Redis compatible server, shared by every worker.\n
+    Needs the redis package. When the server can't be reached, attempts are let
+    through instead of failing every login."""
+
+    # Atomic refill-and-take on the server clock, returns the wait as a string to keep decimals.
+    _TAKE_SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local per_second = tonumber(ARGV[2])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * per_second)
+    local retry_after = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        retry_after = (1 - tokens) / per_second
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / per_second) + 1)
+    return tostring(retry_after)
+    """
+
+    def __init__(self, url: str, prefix: str = "login_throttle:"):
+        """:param url: server URL, e.g. redis://localhost:6379/0.
+        :param prefix: prefix of every bucket key."""
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:
+            raise RuntimeError("AUTH_LOGIN_THROTTLE_STORE_URL requires the redis package.") from exc
+
+        self._client = redis_asyncio.from_url(url)
+        self._take = self._client.register_script(self._TAKE_SCRIPT)
+        self._prefix = prefix
+
+    async def take(self, key: str, capacity: int, per_second: float) -> float:
+        try:
+            return float(await self._take(keys=[self._prefix + key], args=[capacity, per_second]))
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning(f"Login throttle store unavailable, letting attempt through: {exc}")
+            return 0.0
+
+
+class LoginThrottle:
+    """Per-IP and per-email token buckets plus a cap on concurrent password verifications."""
+
+    def __init__(
+        self,
+        store: ThrottleStore,
+        ip_burst: int,
+        ip_per_minute: float,
+        email_burst: int,
+        email_per_minute: float,
+        max_concurrent_verifications: int,
+        trust_forwarded_for: bool = False,
+    ):
+        """:param store: token buckets store.
+        :param ip_burst: attempts an IP may make at once.
+        :param ip_per_minute: attempts an IP regains per minute.
+        :param email_burst: attempts on an email at once.
+        :param email_per_minute: attempts on an email regained per minute.
+        :param max_concurrent_verifications: bcrypt verifications admitted at the same time.
+        :param trust_forwarded_for: take client IP from X-Forwarded-For, only behind a trusted proxy."""
+        # Rates divide the wait until a token is back, so a bucket must refill.
+        if ip_per_minute <= 0 or email_per_minute <= 0:
+            raise ValueError("AUTH_LOGIN_IP_PER_MINUTE and AUTH_LOGIN_EMAIL_PER_MINUTE must be greater than 0.")
+
+        self.store = store
+        self.ip_burst = ip_burst
+        self.ip_per_second = ip_per_minute / 60
+        self.email_burst = email_burst
+        self.email_per_second = email_per_minute / 60
+        self.max_concurrent_verifications = max_concurrent_verifications
+        self.trust_forwarded_for = trust_forwarded_for
+        self.verifications = 0
+
+    def client_ip(self, request: Request) -> str:
+        """Return the IP the request comes from."""
+        forwarded_for = request.headers.get("X-Forwarded-For") if self.trust_forwarded_for else None
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+        return request.client.host if request.client else "unknown"
+
+    async def check(self, request: Request, email: str) -> None:
+        """Take a token from the IP and email buckets, raise 429 when either is empty.\n
+        :param request: login request.
+        :param email: email the login is attempted on."""
+        retry_after = await self.store.take(
+            f"ip:{self.client_ip(request)}", capacity=self.ip_burst, per_second=self.ip_per_second
+        )
+        if not retry_after:
+            retry_after = await self.store.take(
+                f"email:{email.lower()}", capacity=self.email_burst, per_second=self.email_per_second
+            )
+        if retry_after:
+            raise TooManyRequestsException(retry_after=retry_after, message="Too many login attempts.")
+
+    @asynccontextmanager
+    async def verification(self) -> AsyncIterator[None]:
+        """Hold a verification slot, raise 429 right away when all of them are taken."""
+        if self.verifications >= self.max_concurrent_verifications:
+            raise TooManyRequestsException(retry_after=1, message="Too many logins in progress.")
+
+        self.verifications += 1
+        try:
+            yield
+        finally:
+            self.verifications -= 1
+
+
+def build_store(url: Optional[str]) -> ThrottleStore:
+    """Redis compatible store when an URL is configured, in-memory otherwise."""
+    if url:
+        return RedisThrottleStore(url=url)
+    return MemoryThrottleStore(max_keys=AUTHSETTINGS.LOGIN_THROTTLE_MAX_KEYS)
+
+
+login_throttle = LoginThrottle(
+    store=build_store(AUTHSETTINGS.LOGIN_THROTTLE_STORE_URL),
+    ip_burst=AUTHSETTINGS.LOGIN_IP_BURST,
+    ip_per_minute=AUTHSETTINGS.LOGIN_IP_PER_MINUTE,
+    email_burst=AUTHSETTINGS.LOGIN_EMAIL_BURST,
+    email_per_minute=AUTHSETTINGS.LOGIN_EMAIL_PER_MINUTE,
+    max_concurrent_verifications=AUTHSETTINGS.LOGIN_MAX_CONCURRENT_VERIFICATIONS,
+    trust_forwarded_for=AUTHSETTINGS.LOGIN_TRUST_FORWARDED_FOR,
+)
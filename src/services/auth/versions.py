@@ -0,0 +1,127 @@
+"""This module tracks the current token version of users to revoke issued tokens."""
+import asyncio
+import uuid
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import models
+from src.database.database import async_session
+from src.utils.cache import TTLCache
+from src.utils.logger import get_logger
+
+from .settings import AUTHSETTINGS
+
+
+logger = get_logger()
+
+# Version of a user that no longer exists, no token matches it.
+DELETED = -1
+
+
+class TokenVersionRegistry:
+    """Cache of users' token_version, kept fresh by a periodic bulk refresh.\n
+    A token is valid only while the version it was issued with is the current
+    one; bumping the version (role or password change) revokes every token of
+    the user. Writes made by this worker apply at once, the others are picked up
+    by the next refresh, a single query for every cached user."""
+
+    def __init__(self, maxsize: int, refresh_interval: float):
+        """:param maxsize: max qty of users whose version is kept.
+        :param refresh_interval: seconds between bulk refreshes, the most another worker's revocation can lag."""
+        self.refresh_interval = refresh_interval
+        # The TTL is a fallback for when the refresher isn't running.
+        self._versions = TTLCache(maxsize=maxsize, ttl=refresh_interval * 2)
+        self._task: Optional[asyncio.Task] = None
+
+    async def is_current(self, user_id: uuid.UUID, version: int) -> bool:
+        """Check a token version is the current one of an user.\n
+        :param user_id: user the token was issued to.
+        :param version: token_version claim of the token.
+        :return: False for revoked tokens and deleted users."""
+        current = self._versions.get(user_id)
+        # Unknown user, or a token issued after a bump made by another worker.
+        if current is None or (version > current != DELETED):
+            current = await self._reload(user_id)
+        return version == current
+
+    def set(self, user_id: uuid.UUID, version: int) -> None:
+        """Record a version just written by this worker."""
+        self._store(user_id, version)
+
+    def invalidate(self, user_ids: Optional[Iterable[uuid.UUID]] = None) -> None:
+        """Forget the version of some users, or of all when None; their next check reloads it."""
+        if user_ids is None:
+            self._versions.clear()
+            return
+        for user_id in user_ids:
+            self._versions.pop(user_id)
+
+    async def refresh(self) -> None:
+        """Reload the version of every cached user with one query."""
+        user_ids = [user_id for user_id, _ in self._versions.items()]
+        if not user_ids:
+            return
+
+        versions = await self.load(user_ids)
+        for user_id in user_ids:
+            self._store(user_id, versions.get(user_id, DELETED))
+
+    async def _reload(self, user_id: uuid.UUID) -> int:
+        return self._store(user_id, (await self.load([user_id])).get(user_id, DELETED))
+
+    def _store(self, user_id: uuid.UUID, version: int) -> int:
+        # Versions only grow, so a read that raced a newer write can't roll it back.
+        current = self._versions.get(user_id)
+        if current is not None and version != DELETED and current > version:
+            version = current
+        self._versions.set(user_id, version)
+        return version
+
+    @classmethod
+    async def load(cls, user_ids: Iterable[uuid.UUID], db: Optional[AsyncSession] = None) -> Dict[uuid.UUID, int]:
+        """Read the token version of many users with one query.\n
+        :param user_ids: users to read, missing ones are left out.
+        :param db: session to use, a new one when None.
+        :return: token version by user ID."""
+        if db is None:
+            async with async_session() as session:
+                return await cls.load(user_ids, db=session)
+
+        ids_param = bindparam("ids", value=list(user_ids), type_=ARRAY(models.User.id.type))
+        stmt = select(models.User.id, models.User.token_version).where(models.User.id == any_(ids_param))
+        result = await db.execute(stmt)
+        return dict(result.tuples().all())
+
+    def start(self) -> None:
+        """Start the refresher task on the running loop if it isn't running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="token-version-refresher")
+
+    async def stop(self) -> None:
+        """Stop the refresher task."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"An unexpected error refreshing token versions has occurred. {e}")
+
+
+token_versions = TokenVersionRegistry(
+    maxsize=AUTHSETTINGS.PRINCIPAL_CACHE_MAXSIZE,
+    refresh_interval=AUTHSETTINGS.TOKEN_VERSION_REFRESH_SECONDS
+)
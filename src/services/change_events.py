@@ -0,0 +1,153 @@
+"""This module broadcasts row changes to every worker through Postgres LISTEN/NOTIFY."""
+import asyncio
+import json
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+import asyncpg
+from sqlalchemy import String, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.core import core_settings
+from src.database.database import async_engine
+from src.utils.logger import get_logger
+
+
+logger = get_logger()
+
+CHANNEL = "catalog_changes"
+# Identifies this process, so it skips the events it published itself.
+ORIGIN = uuid.uuid4().hex
+# NOTIFY payloads must stay under 8000 bytes, a UUID takes 39 of them in JSON.
+IDS_PER_EVENT = 150
+
+# Handler of a table's events: operation and changed IDs, None when every row may have changed.
+ChangeHandler = Callable[[str, Optional[List[uuid.UUID]]], None]
+
+
+async def publish(db: AsyncSession, table: str, op: str, ids: Iterable[uuid.UUID]) -> None:
+    """Queue change events in the session's transaction; Postgres delivers them on commit,
+    and drops them on rollback, so listeners never hear of changes that didn't happen.\n
+    :param db: session about to commit the change.
+    :param table: name of the changed table.
+    :param op: create, update, upsert or delete.
+    :param ids: IDs of the changed rows."""
+    if not core_settings.CHANGE_EVENTS_ENABLED:
+        return
+
+    ids = [str(id) for id in ids]
+    payloads = [
+        json.dumps({"origin": ORIGIN, "table": table, "op": op, "ids": ids[start:start + IDS_PER_EVENT]})
+        for start in range(0, len(ids), IDS_PER_EVENT)
+    ]
+    if not payloads:
+        return
+
+    # One round trip whatever the qty of events.
+    payloads_param = bindparam("payloads", value=payloads, type_=ARRAY(String))
+    await db.execute(select(func.pg_notify(CHANNEL, func.unnest(payloads_param))))
+
+
+class ChangeListener:
+    """Dedicated LISTEN connection of this worker, dispatching change events to
+    the handlers subscribed to each table.\n
+    Events published while the connection was down are lost, so every handler
+    is told that all its rows may have changed once it is back."""
+
+    def __init__(self, dsn: str, channel: str, reconnect_interval: float):
+        """:param dsn: postgresql:// connection URL of the primary.
+        :param channel: channel events are published on.
+        :param reconnect_interval: seconds between connection checks and reconnection attempts."""
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_interval = reconnect_interval
+        self._handlers: Dict[str, List[ChangeHandler]] = defaultdict(list)
+        self._task: Optional[asyncio.Task] = None
+        self._listening = asyncio.Event()
+
+    def subscribe(self, table: str, handler: ChangeHandler) -> None:
+        """Call handler on every event of table published by another worker."""
+        self._handlers[table].append(handler)
+
+    def _dispatch(self, table: str, op: str, ids: Optional[List[uuid.UUID]]) -> None:
+        for handler in self._handlers.get(table, ()):
+            try:
+                handler(op, ids)
+            except Exception as e:
+                logger.error(f"An unexpected error handling a {table} change event has occurred. {e}")
+
+    def _on_notification(self, conn: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            if event["origin"] == ORIGIN:
+                return
+            table, op = event["table"], event["op"]
+            ids = [uuid.UUID(id) for id in event["ids"]]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring malformed change event {payload!r}. {e}")
+            return
+
+        self._dispatch(table, op, ids)
+
+    async def start(self) -> None:
+        """Start listening, waiting at most reconnect_interval for the connection."""
+        if not core_settings.CHANGE_EVENTS_ENABLED:
+            return
+        if self._task is None or self._task.done():
+            self._listening = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="change-listener")
+        try:
+            await asyncio.wait_for(self._listening.wait(), timeout=self.reconnect_interval)
+        except asyncio.TimeoutError:
+            logger.warning("Change listener isn't connected yet, caches may serve other workers' stale rows.")
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        reconnecting = False
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.dsn)
+                await conn.add_listener(self.channel, self._on_notification)
+                if reconnecting:
+                    logger.info("Change listener reconnected, flushing local caches.")
+                    for table in list(self._handlers):
+                        self._dispatch(table, "reset", None)
+                self._listening.set()
+
+                # Notifications arrive on their own; only check the connection is alive.
+                while not conn.is_closed():
+                    await asyncio.sleep(self.reconnect_interval)
+                    await asyncio.wait_for(conn.execute("SELECT 1"), timeout=self.reconnect_interval)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Change listener connection lost, retrying in {self.reconnect_interval}s. {e!r}")
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close(timeout=self.reconnect_interval)
+
+            self._listening.clear()
+            reconnecting = True
+            await asyncio.sleep(self.reconnect_interval)
+
+
+change_listener = ChangeListener(
+    dsn=async_engine.url.set(drivername="postgresql").render_as_string(hide_password=False),
+    channel=CHANNEL,
+    reconnect_interval=core_settings.CHANGE_EVENTS_RECONNECT_SECONDS,
+)
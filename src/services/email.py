@@ -1,23 +1,30 @@
 """This module handle service for email sending."""
+import asyncio
 import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
-from jinja2 import Template
 from pydantic import BaseModel, EmailStr
 from sqlalchemy import select
 
 from src.config.core import core_settings
-from src.helpers.db import get_db
+from src.database.database import async_session
 from src.models import User
 from src.utils.enumerators import UserType
 from src.utils.logger import get_logger
 
 
+if TYPE_CHECKING:
+    from fastapi_mail import ConnectionConfig, FastMail
+    from jinja2 import Template
+
+
 logger = get_logger()
 
+TEMPLATE_FOLDER = Path(__file__).parent.parent / "utils" / "templates"
+
 
 class EmailSchema(BaseModel):
     """Schema model for Email sending."""
@@ -25,66 +32,178 @@ class EmailSchema(BaseModel):
 
 
 class EmailService:
-    """This class handle emailing."""
-
-    _conf = ConnectionConfig(
-        MAIL_USERNAME = os.getenv("APP_MAIL"),
-        MAIL_PASSWORD = os.getenv("APP_MAIL_PASSWORD"),
-        MAIL_FROM = os.getenv("APP_MAIL"),
-        MAIL_PORT = 587,
-        MAIL_SERVER = "smtp.gmail.com",
-        MAIL_FROM_NAME = core_settings.APP_NAME,
-        MAIL_STARTTLS = True,
-        MAIL_SSL_TLS = False,
-        USE_CREDENTIALS = True,
-        VALIDATE_CERTS = True,
-        TEMPLATE_FOLDER = Path(__file__).parent.parent / "utils" / "templates"
-    )
+    """This class handle emailing.\n
+    Admin notifications are coalesced: they are collected for
+    EMAIL_DIGEST_WINDOW_SECONDS and then sent as a single digest email.\n
+    fastapi_mail and jinja2 are slow to import, so they are loaded in a worker
+    thread by the startup warm-up, or else when the first digest is sent."""
+
+    _client: Optional["FastMail"] = None
+    _templates: Dict[str, "Template"] = {}
+
+    _admin_recipients: Optional[List[str]] = None
+    _admin_recipients_expire_at: float = 0.0
+
+    _pending: List[str] = []
+    _flush_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def warm_up(cls) -> None:
+        """Import the mail libraries, compile templates and build the mail client ahead of
+        the first notification. Blocking, meant to run in a worker thread."""
+        cls._get_template("mail_notif.html")
+        cls._get_client()
+
+    @classmethod
+    def backlog(cls) -> int:
+        """Qty of notifications waiting for the next digest."""
+        return len(cls._pending)
 
     @classmethod
     async def notify_admin(cls, message: Optional[str] = None) -> None:
-        """Send email notifications to ADMIN users.\n
+        """Queue a notification for ADMIN users, sent with the next digest.\n
         :param message: Message to be sent to users.
         :return: None."""
+        cls._pending.append(message or "System modifies.")
+        if cls._flush_task is None or cls._flush_task.done():
+            cls._flush_task = asyncio.create_task(cls._flush_after(core_settings.EMAIL_DIGEST_WINDOW_SECONDS))
+
+    @classmethod
+    def invalidate_recipients(cls) -> None:
+        """Forget cached admin recipients, e.g. after an user is created or changed."""
+        cls._admin_recipients = None
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Send pending notifications right away, used on shutdown."""
+        if cls._flush_task is not None and not cls._flush_task.done():
+            cls._flush_task.cancel()
+            try:
+                await cls._flush_task
+            except asyncio.CancelledError:
+                pass
+        cls._flush_task = None
+        await cls.flush()
+
+    @classmethod
+    async def _flush_after(cls, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await cls.flush()
+
+    @classmethod
+    async def flush(cls) -> None:
+        """Send every pending notification as one digest email."""
+        messages, cls._pending = cls._pending, []
+        if not messages:
+            return
+
         try:
-            async for db in get_db():
-                fm = FastMail(config=cls._conf)
-
-                stmt = select(User.email).filter(User.user_type == UserType.ADMIN.value)
-                scalars = await db.scalars(stmt)
-                user_receivers = scalars.all()
-
-                rendered_html = cls._get_rendered_template(template_name="mail_notif.html", message=message)
-
-                await fm.send_message(
-                    MessageSchema(
-                        recipients=user_receivers,
-                        subject="System Notification",
-                        # body=f"""<p>Hi this test mail, thanks for using Fastapi-mail : {message}</p> """,
-                        body=rendered_html,
-                        subtype=MessageType.html
-                    )
+            user_receivers = await cls._get_admin_recipients()
+            if not user_receivers:
+                return
+
+            from fastapi_mail import MessageSchema, MessageType
+
+            shown = messages[:core_settings.EMAIL_DIGEST_MAX_ITEMS]
+            rendered_html = cls._get_rendered_template(
+                template_name="mail_notif.html",
+                message=shown[0] if len(messages) == 1 else None,
+                messages=shown if len(messages) > 1 else None,
+                omitted=len(messages) - len(shown),
+            )
+
+            await cls._get_client().send_message(
+                MessageSchema(
+                    recipients=user_receivers,
+                    subject="System Notification" if len(messages) == 1 else f"System Notifications ({len(messages)})",
+                    body=rendered_html,
+                    subtype=MessageType.html
                 )
+            )
 
         except Exception as e:
             logger.error(f"Error enviando email: {e}")
 
+    @staticmethod
+    def _build_config() -> "ConnectionConfig":
+        """Return SMTP connection settings."""
+        from fastapi_mail import ConnectionConfig
+
+        return ConnectionConfig(
+            MAIL_USERNAME = os.getenv("APP_MAIL"),
+            MAIL_PASSWORD = os.getenv("APP_MAIL_PASSWORD"),
+            MAIL_FROM = os.getenv("APP_MAIL"),
+            MAIL_PORT = 587,
+            MAIL_SERVER = "smtp.gmail.com",
+            MAIL_FROM_NAME = core_settings.APP_NAME,
+            MAIL_STARTTLS = True,
+            MAIL_SSL_TLS = False,
+            USE_CREDENTIALS = True,
+            VALIDATE_CERTS = True,
+            TEMPLATE_FOLDER = TEMPLATE_FOLDER
+        )
+
+    @classmethod
+    def _get_client(cls) -> "FastMail":
+        """Return the shared mail client."""
+        if cls._client is None:
+            from fastapi_mail import FastMail
+
+            cls._client = FastMail(config=cls._build_config())
+        return cls._client
+
+    @classmethod
+    async def _get_admin_recipients(cls) -> List[str]:
+        """Return ADMIN emails, cached for EMAIL_RECIPIENTS_CACHE_TTL_SECONDS."""
+        if cls._admin_recipients is not None and cls._admin_recipients_expire_at > time.monotonic():
+            return cls._admin_recipients
+
+        async with async_session() as db:
+            stmt = select(User.email).filter(User.user_type == UserType.ADMIN.value)
+            scalars = await db.scalars(stmt)
+            recipients = list(scalars.all())
+
+        cls._admin_recipients = recipients
+        cls._admin_recipients_expire_at = time.monotonic() + core_settings.EMAIL_RECIPIENTS_CACHE_TTL_SECONDS
+        return recipients
+
+    @classmethod
+    def _get_template(cls, template_name: str) -> "Template":
+        """Return a compiled Jinja2 template, read from disk only once.
+        :param template_name: .html template file.
+        :return: Template."""
+        template = cls._templates.get(template_name)
+        if template is None:
+            from jinja2 import Template
+
+            tmp_path = TEMPLATE_FOLDER/f"{template_name}"
+            with open(tmp_path, 'r', encoding='utf-8') as tmp_file:
+                template = Template(tmp_file.read())
+            cls._templates[template_name] = template
+        return template
+
     @classmethod
-    def _get_rendered_template(cls, template_name: str, message: str) -> str:
+    def _get_rendered_template(
+        cls,
+        template_name: str,
+        message: Optional[str] = None,
+        messages: Optional[List[str]] = None,
+        omitted: int = 0
+    ) -> str:
         """Return html template by Jinja2.
         :param template_name: .html template file.
         :param message: Notification message to be sent.
+        :param messages: Notifications of a digest, listed instead of message.
+        :param omitted: Qty of digest notifications left out of messages.
         :return: str."""
-        tmp_path = cls._conf.TEMPLATE_FOLDER/f"{template_name}"
-        with open(tmp_path, 'r', encoding='utf-8') as tmp_file:
-            template_content = tmp_file.read()
-
-        template = Template(template_content)
-        rendered_html = template.render(
+        now = datetime.now()
+        rendered_html = cls._get_template(template_name).render(
             message=message or "System modifies.",
-            date=datetime.now().strftime("%d/%m/%Y"),
-            time=datetime.now().strftime("%H:%M:%S"),
-            reference_id=f"REF-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            messages=messages,
+            omitted=omitted,
+            date=now.strftime("%d/%m/%Y"),
+            time=now.strftime("%H:%M:%S"),
+            reference_id=f"REF-{now.strftime('%Y%m%d%H%M%S')}",
             app_name=core_settings.APP_NAME,
         )
 
@@ -0,0 +1,224 @@
+"""This module stores responses of write requests by Idempotency-Key, so retries replay them."""
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.config.core import core_settings
+from src.database.database import async_session
+from src.models import IdempotencyKey
+from src.utils.cache import TTLCache
+from src.utils.logger import get_logger
+
+
+logger = get_logger()
+
+# Seconds between checks of a key held by another worker.
+POLL_INTERVAL = 0.1
+
+
+class StoredResponse(NamedTuple):
+    """Response of the first request made with a key."""
+    fingerprint: Optional[str]
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+
+class Claim(NamedTuple):
+    """Outcome of claiming a key: run the request (owner), replay a stored
+    response (stored) or wait for the request running with it."""
+    owner: bool = False
+    stored: Optional[StoredResponse] = None
+
+
+class IdempotencyStore:
+    """Idempotency keys in an in-memory LRU backed by the idempotency_keys table.\n
+    The first request claims its key with an INSERT, so exactly one worker runs
+    it; duplicates wait for it to finish and get its response. Responses are
+    served from memory by the worker that stored them and from the table by
+    the others, never touching the catalog tables."""
+
+    def __init__(self, ttl: float, lock_timeout: float, maxsize: int, max_bytes: int, purge_interval: float):
+        """:param ttl: seconds a response is replayed.
+        :param lock_timeout: seconds a duplicate waits for the first request, after which
+            a claim not completed is taken over, must exceed the slowest write.
+        :param maxsize: max qty of responses kept in memory.
+        :param max_bytes: max sum of in-memory response bodies.
+        :param purge_interval: seconds between deletions of expired keys."""
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.purge_interval = purge_interval
+        self._responses = TTLCache(
+            maxsize=maxsize, ttl=ttl, max_weight=max_bytes,
+            weigher=lambda stored: len(stored.body)
+        )
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def claim(self, key: str) -> Claim:
+        """Claim key for a request unless a response is stored or a request holds it.\n
+        :param key: scoped key hash.
+        :return: Claim, neither owner nor stored while another request holds the key."""
+        stored = self._responses.get(key)
+        if stored is not None:
+            return Claim(stored=stored)
+        if key in self._in_flight:
+            return Claim()
+
+        now = datetime.now(UTC)
+        self._in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            async with async_session() as db:
+                stmt = pg_insert(IdempotencyKey).values(key=key, expires_at=now + timedelta(seconds=self.ttl))
+                # An expired key, or one whose request died without completing, is taken over.
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[IdempotencyKey.key],
+                    set_={
+                        "fingerprint": None, "status_code": None, "headers": None, "body": None,
+                        "created_at": now, "expires_at": stmt.excluded.expires_at,
+                    },
+                    where=or_(
+                        IdempotencyKey.expires_at <= now,
+                        (IdempotencyKey.status_code.is_(None))
+                        & (IdempotencyKey.created_at <= now - timedelta(seconds=self.lock_timeout)),
+                    ),
+                ).returning(IdempotencyKey.id)
+                claimed = await db.scalar(stmt)
+                await db.commit()
+                if claimed is not None:
+                    return Claim(owner=True)
+
+                stored = await self._load(key)
+
+        except BaseException:
+            self._in_flight.pop(key).cancel()
+            raise
+
+        # Held by another worker, or completed by it.
+        self._in_flight.pop(key).set_result(stored)
+        return Claim(stored=stored)
+
+    async def _load(self, key: str) -> Optional[StoredResponse]:
+        """Read a completed response from the table, caching it."""
+        async with async_session() as db:
+            row = await db.scalar(
+                select(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .where(IdempotencyKey.status_code.is_not(None))
+                .where(IdempotencyKey.expires_at > func.now())
+            )
+        if row is None:
+            return None
+
+        stored = StoredResponse(
+            fingerprint=row.fingerprint, status_code=row.status_code,
+            headers=[tuple(header) for header in row.headers], body=row.body
+        )
+        self._responses.set(key, stored, ttl=(row.expires_at - datetime.now(UTC)).total_seconds())
+        return stored
+
+    async def wait(self, key: str) -> Optional[StoredResponse]:
+        """Wait at most lock_timeout for the request holding key.\n
+        :return: its response, None when it failed, timed out or wasn't stored."""
+        future = self._in_flight.get(key)
+        if future is not None:
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout=self.lock_timeout)
+            except asyncio.TimeoutError:
+                return None
+            except asyncio.CancelledError:
+                # The claim failed, as opposed to this request being cancelled.
+                if future.cancelled():
+                    return None
+                raise
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            stored = self._responses.get(key) or await self._load(key)
+            if stored is not None:
+                return stored
+        return None
+
+    def is_held(self, key: str) -> bool:
+        """Check whether a request of this worker holds key."""
+        return key in self._in_flight
+
+    async def complete(self, key: str, stored: Optional[StoredResponse]) -> None:
+        """Store the response of the request holding key and wake its duplicates.\n
+        :param stored: response to replay, None releases the key so a retry runs again."""
+        future = self._in_flight.pop(key, None)
+        try:
+            async with async_session() as db:
+                if stored is None:
+                    await db.execute(
+                        delete(IdempotencyKey)
+                        .where(IdempotencyKey.key == key)
+                        .where(IdempotencyKey.status_code.is_(None))
+                    )
+                else:
+                    await db.execute(
+                        update(IdempotencyKey)
+                        .where(IdempotencyKey.key == key)
+                        .values(
+                            fingerprint=stored.fingerprint, status_code=stored.status_code,
+                            headers=[list(header) for header in stored.headers], body=stored.body
+                        )
+                    )
+                await db.commit()
+            if stored is not None:
+                self._responses.set(key, stored)
+
+        except Exception as e:
+            logger.error(f"An unexpected error storing an idempotent response has occurred. {e}")
+            stored = None
+
+        finally:
+            if future is not None and not future.done():
+                future.set_result(stored)
+
+    async def purge_expired(self) -> int:
+        """Delete expired keys from the table.\n
+        :return: qty of keys deleted."""
+        async with async_session() as db:
+            result = await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= func.now()))
+            await db.commit()
+        return result.rowcount
+
+    def start(self) -> None:
+        """Start the purge task on the running loop if it isn't running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="idempotency-purger")
+
+    async def stop(self) -> None:
+        """Stop the purge task."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.purge_interval)
+            try:
+                await self.purge_expired()
+            except Exception as e:
+                logger.error(f"An unexpected error purging idempotency keys has occurred. {e}")
+
+
+idempotency_store = IdempotencyStore(
+    ttl=core_settings.IDEMPOTENCY_KEY_TTL_SECONDS,
+    lock_timeout=core_settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS,
+    maxsize=core_settings.IDEMPOTENCY_CACHE_MAXSIZE,
+    max_bytes=core_settings.IDEMPOTENCY_CACHE_MAX_BYTES,
+    purge_interval=core_settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+)
@@ -0,0 +1,99 @@
+"""This module keeps pre-serialized product responses in memory."""
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any, List, NamedTuple, Optional
+
+from src.config.core import core_settings
+from src.middlewares.timing import timed
+from src.schemas import ProductResponseSchema
+from src.utils.cache import TTLCache
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+class CachedProduct(NamedTuple):
+    """Encoded JSON body of a product and its ETag."""
+    body: bytes
+    etag: str
+
+
+class ProductCache:
+    """Read-through cache of encoded ProductResponseSchema bodies by product ID."""
+
+    def __init__(self, maxsize: int, ttl: float, max_bytes: int):
+        """:param maxsize: max qty of products kept.
+        :param ttl: seconds a product is served from memory.
+        :param max_bytes: max sum of cached body sizes."""
+        self._cache = TTLCache(
+            maxsize=maxsize, ttl=ttl, max_weight=max_bytes,
+            weigher=lambda entry: len(entry.body)
+        )
+        # Bumped on each invalidation so a read racing a write can't store a stale row.
+        self.generation = 0
+
+    @staticmethod
+    def make_etag(product: Any) -> str:
+        """Build a strong ETag from product's last modification time."""
+        modified_at = product.updated_at or product.created_at
+        return f'"{(modified_at - EPOCH) // timedelta(microseconds=1):x}"'
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """Check an If-None-Match header against an ETag (weak comparison)."""
+        if not if_none_match:
+            return False
+
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    @staticmethod
+    def parse_etags(if_match: str) -> List[datetime]:
+        """Read the modification times an If-Match header stands for.\n
+        Weak and foreign ETags are skipped: If-Match uses strong comparison.
+        :return: updated_at values, empty when none of the ETags is ours."""
+        versions = []
+        for tag in if_match.split(","):
+            tag = tag.strip()
+            if not (len(tag) > 2 and tag[0] == tag[-1] == '"'):
+                continue
+            try:
+                versions.append(EPOCH + timedelta(microseconds=int(tag[1:-1], 16)))
+            except (ValueError, OverflowError):
+                continue
+        return versions
+
+    def get(self, product_id: uuid.UUID) -> Optional[CachedProduct]:
+        """Return the cached entry of a product."""
+        return self._cache.get(product_id)
+
+    def put(self, product: Any, generation: Optional[int] = None, ttl: Optional[float] = None) -> CachedProduct:
+        """Serialize product once and cache it.\n
+        :param product: Product SQLAlchemy obj.
+        :param generation: value of self.generation read before the product was queried;
+            the entry isn't stored when an invalidation happened since.
+        :param ttl: seconds the entry is served, cache default when None.
+        :return: cached entry."""
+        with timed("serialize"):
+            entry = CachedProduct(
+                body=ProductResponseSchema.model_validate(product).model_dump_json().encode(),
+                etag=self.make_etag(product)
+            )
+        if generation is None or generation == self.generation:
+            self._cache.set(product.id, entry, ttl=ttl)
+        return entry
+
+    def invalidate(self, product_id: Optional[uuid.UUID] = None) -> None:
+        """Evict one product, or all of them when no ID is given."""
+        self.generation += 1
+        if product_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(product_id)
+
+
+product_cache = ProductCache(
+    maxsize=core_settings.PRODUCT_CACHE_MAXSIZE,
+    ttl=core_settings.PRODUCT_CACHE_TTL_SECONDS,
+    max_bytes=core_settings.PRODUCT_CACHE_MAX_BYTES,
+)
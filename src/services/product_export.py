@@ -0,0 +1,42 @@
+"""This module streams the whole catalog as NDJSON or CSV."""
+import csv
+import io
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.config.core import core_settings
+from src.crud import product_crud
+from src.database.database import async_session
+from src.schemas import ProductResponseSchema
+from src.utils.enumerators import ImportFormat
+
+
+EXPORT_COLUMNS = list(ProductResponseSchema.model_fields)
+
+
+async def export_products(fmt: ImportFormat, sessionmaker: async_sessionmaker = async_session) -> AsyncIterator[bytes]:
+    """Yield the encoded catalog chunk by chunk.\n
+    Opens its own session: request scoped ones are closed before a
+    StreamingResponse body starts being sent.\n
+    :param fmt: output format.
+    :param sessionmaker: where to read from, the primary by default.
+    :return: async iterator of encoded chunks."""
+    if fmt is ImportFormat.CSV:
+        yield (",".join(EXPORT_COLUMNS) + "\r\n").encode()
+
+    async with sessionmaker() as db:
+        async for products in product_crud.stream(db=db, chunk_size=core_settings.PRODUCT_EXPORT_CHUNK_SIZE):
+            if fmt is ImportFormat.CSV:
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+                writer.writerows(
+                    ProductResponseSchema.model_validate(product).model_dump(mode="json")
+                    for product in products
+                )
+                yield buffer.getvalue().encode()
+            else:
+                yield b"".join(
+                    ProductResponseSchema.model_validate(product).model_dump_json().encode() + b"\n"
+                    for product in products
+                )
@@ -0,0 +1,192 @@
+"""This module handles streamed bulk product imports."""
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from fastapi import Request
+from pydantic import ValidationError
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.core import core_settings
+from src.crud import product_crud
+from src.middlewares.exceptions import BadRequestException
+from src.schemas import (ProductCreateSchema, ProductImportResponseSchema,
+                         ProductImportRowSchema)
+from src.services.audit import AuditService
+from src.services.auth import Principal
+from src.utils.enumerators import ImportFormat, ImportRowStatus
+
+
+async def iter_lines(request: Request) -> AsyncIterator[str]:
+    """Yield text lines of the request body as it is received, without line breaks.
+    A body that isn't UTF-8 is rejected with the offset of the first invalid byte."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    offset = 0
+
+    def decode(chunk: bytes, final: bool = False) -> str:
+        buffered, _ = decoder.getstate()
+        try:
+            return decoder.decode(chunk, final=final)
+        except UnicodeDecodeError as exc:
+            raise BadRequestException(
+                message=f"Body isn't valid UTF-8 at byte {offset - len(buffered) + exc.start}."
+            ) from exc
+
+    async for chunk in request.stream():
+        pending += decode(chunk)
+        offset += len(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    pending += decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Join the physical lines of CSV records whose quoted fields hold line breaks.
+    Quotes inside a field are doubled, so a record is complete once its quotes are balanced."""
+    record = None
+    async for line in lines:
+        record = line if record is None else f"{record}\n{line}"
+        if record.count('"') % 2 == 0:
+            yield record
+            record = None
+
+    if record is not None:
+        # Unterminated quoted field, csv reports it as the row's error.
+        yield record
+
+
+async def iter_records(request: Request, fmt: ImportFormat) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (row number, raw record) pairs parsed from NDJSON or CSV lines.
+    Records that can't be parsed are yielded as the ValueError raised."""
+    header = None
+    row_number = 0
+    lines = iter_lines(request)
+    if fmt is ImportFormat.CSV:
+        lines = iter_csv_rows(lines)
+
+    async for line in lines:
+        if not line.strip():
+            continue
+        if fmt is ImportFormat.CSV and header is None:
+            header = [column.strip() for column in next(csv.reader([line]))]
+            continue
+
+        row_number += 1
+        try:
+            if fmt is ImportFormat.CSV:
+                values = next(csv.reader([line], strict=True))
+                if len(values) != len(header):
+                    raise ValueError(f"Expected {len(header)} columns, got {len(values)}.")
+                yield row_number, dict(zip(header, values))
+            else:
+                yield row_number, json.loads(line)
+
+        except (ValueError, csv.Error) as exc:
+            yield row_number, ValueError(str(exc))
+
+
+class ProductImportService:
+    """Validate streamed product rows in chunks and upsert them by SKU."""
+
+    def __init__(self, db: AsyncSession, current_user: Principal, request: Request):
+        """:param db: Async db session.
+        :param current_user: user performing the import, for auditing.
+        :param request: incoming request whose body holds the rows."""
+        self.db = db
+        self.current_user = current_user
+        self.request = request
+        self.results: List[ProductImportRowSchema] = []
+
+    async def run(self, fmt: ImportFormat) -> ProductImportResponseSchema:
+        """Consume the whole request body and return the per-row report."""
+        batch: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+        async for row_number, record in iter_records(self.request, fmt):
+            # Earlier batches are already committed, so report the cut instead of failing the request.
+            if row_number > core_settings.PRODUCT_IMPORT_MAX_ROWS:
+                self._fail(row_number, record, [
+                    f"Bulk import is limited to {core_settings.PRODUCT_IMPORT_MAX_ROWS} rows, "
+                    "this and later rows were not imported."
+                ])
+                break
+
+            try:
+                if isinstance(record, ValueError):
+                    raise record
+                product_in = ProductCreateSchema.model_validate(record)
+
+            except ValidationError as exc:
+                self._fail(row_number, record, [
+                    ": ".join(filter(None, [".".join(str(loc) for loc in err["loc"]), err["msg"]]))
+                    for err in exc.errors()
+                ])
+                continue
+            except ValueError as exc:
+                self._fail(row_number, None, [str(exc)])
+                continue
+
+            # A SKU may appear once per statement, later rows go to the next batch.
+            if product_in.sku in batch or len(batch) >= core_settings.PRODUCT_IMPORT_BATCH_SIZE:
+                await self._flush(batch)
+                batch = {}
+            batch[product_in.sku] = (row_number, product_in.model_dump())
+
+        await self._flush(batch)
+
+        self.results.sort(key=lambda result: result.row)
+        counts = {status: 0 for status in ImportRowStatus}
+        for result in self.results:
+            counts[result.status] += 1
+
+        return ProductImportResponseSchema(
+            total=len(self.results),
+            created=counts[ImportRowStatus.CREATED],
+            updated=counts[ImportRowStatus.UPDATED],
+            failed=counts[ImportRowStatus.FAILED],
+            results=self.results,
+        )
+
+    def _fail(self, row_number: int, record: Any, errors: List[str]) -> None:
+        sku = record.get("sku") if isinstance(record, dict) else None
+        self.results.append(ProductImportRowSchema(
+            row=row_number, sku=sku if isinstance(sku, str) else None,
+            status=ImportRowStatus.FAILED, errors=errors
+        ))
+
+    async def _flush(self, batch: Dict[str, Tuple[int, Dict[str, Any]]]) -> None:
+        """Upsert a batch in one statement; when it is rejected (e.g. a name
+        already used by another SKU) retry row by row to isolate the failing ones."""
+        if not batch:
+            return
+
+        try:
+            upserted = await product_crud.bulk_upsert(rows=[data for _, data in batch.values()], db=self.db)
+        except (DataError, IntegrityError):
+            await self.db.rollback()
+            upserted = []
+            for row_number, data in batch.values():
+                try:
+                    upserted.extend(await product_crud.bulk_upsert(rows=[data], db=self.db))
+                except (DataError, IntegrityError) as exc:
+                    await self.db.rollback()
+                    self._fail(row_number, data, [str(exc.orig.__cause__ or exc.orig)])
+
+        for row in upserted:
+            row_number, _ = batch[row.sku]
+            self.results.append(ProductImportRowSchema(
+                row=row_number, sku=row.sku, id=row.id,
+                status=ImportRowStatus.CREATED if row.inserted else ImportRowStatus.UPDATED
+            ))
+
+        if upserted:
+            await AuditService.register(
+                current_user=self.current_user, request=self.request,
+                action=product_crud.bulk_upsert, data={"rows": len(upserted)}
+            )
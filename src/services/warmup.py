@@ -0,0 +1,109 @@
+"""This module warms the app up on startup, so first requests don't pay cold costs."""
+import asyncio
+import time
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from src.config.core import core_settings
+from src.crud import product_crud, user_crud
+from src.database.database import async_engine, async_session
+from src.database.replicas import replica_pool
+from src.services.auth import password_hasher, token_versions
+from src.services.email import EmailService
+from src.services.product_cache import product_cache
+from src.utils.logger import get_logger
+
+
+logger = get_logger()
+
+PLACEHOLDER_ID = uuid.UUID(int=0)
+
+
+async def prime_connection(conn: AsyncConnection) -> None:
+    """Run the hot queries once on a connection.\n
+    asyncpg keeps prepared statements per connection and SQLAlchemy caches
+    compiled SQL per engine, so later requests skip parse/plan and compile."""
+    async with AsyncSession(bind=conn) as db:
+        await product_crud.get(db=db, id=PLACEHOLDER_ID)
+        await product_crud.get_page(db=db, limit=1)
+        await product_crud.get_many(db=db, ids=[PLACEHOLDER_ID])
+        await product_crud.get_by_sku(sku="", db=db)
+        await product_crud.get_by_name(name="", db=db)
+        await user_crud.get(db=db, id=PLACEHOLDER_ID)
+        await user_crud.get_by_email(email="", db=db)
+        await token_versions.load([PLACEHOLDER_ID], db=db)
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open connections at once and prime each one; they stay idle in the pool."""
+    async def open_and_prime() -> None:
+        async with engine.connect() as conn:
+            await prime_connection(conn)
+
+    await asyncio.gather(*(open_and_prime() for _ in range(connections)))
+
+
+async def warm_replicas(connections: int) -> None:
+    """Warm the pool of every replica, a replica down is only logged."""
+    results = await asyncio.gather(
+        *(warm_pool(engine, connections) for engine in replica_pool.engines), return_exceptions=True
+    )
+    for replica, result in zip(replica_pool.replicas, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Warm-up of read replica {replica.name} failed. {result!r}")
+
+
+async def warm_mail() -> None:
+    """Compile the mail template and build the mail client in a worker thread, a failure is only logged."""
+    try:
+        await asyncio.to_thread(EmailService.warm_up)
+    except Exception as e:
+        logger.warning(f"Warm-up of the mail service failed. {e!r}")
+
+
+async def warm_product_cache(size: int) -> int:
+    """Cache the most recently updated products.\n
+    :return: qty of products cached."""
+    generation = product_cache.generation
+    async with async_session() as db:
+        products = await product_crud.get_recently_updated(db=db, limit=size)
+
+    # Oldest first, so the newest products end up as the most recently used entries.
+    for product in reversed(products):
+        product_cache.put(product, generation=generation)
+    return len(products)
+
+
+async def warm_up() -> None:
+    """Open and prime pool connections (replicas' too), fill product cache, load bcrypt
+    and compile the mail template.\n
+    Bounded by STARTUP_WARM_UP_TIMEOUT_SECONDS; a failure is logged and the
+    app starts anyway, paying cold costs on first requests instead."""
+    timeout = core_settings.STARTUP_WARM_UP_TIMEOUT_SECONDS
+    if timeout <= 0:
+        return
+
+    connections = core_settings.DB_POOL_WARM_CONNECTIONS
+    if connections is None:
+        connections = core_settings.DB_POOL_SIZE
+    connections = min(connections, core_settings.DB_POOL_SIZE)
+
+    async def warm_db() -> int:
+        await asyncio.gather(warm_pool(async_engine, connections), warm_replicas(connections))
+        # Runs on an already primed connection instead of opening one more.
+        return await warm_product_cache(core_settings.PRODUCT_CACHE_WARM_SIZE)
+
+    started_at = time.perf_counter()
+    try:
+        cached, *_ = await asyncio.wait_for(
+            asyncio.gather(warm_db(), password_hasher.warm_up(), warm_mail()),
+            timeout=timeout
+        )
+        logger.info(
+            f"Warm-up done in {(time.perf_counter() - started_at) * 1000:.0f}ms: "
+            f"{connections} connections primed, {cached} products cached."
+        )
+
+    except Exception as e:
+        logger.warning(f"Warm-up failed after {(time.perf_counter() - started_at) * 1000:.0f}ms, starting cold. {e!r}")
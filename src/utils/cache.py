@@ -0,0 +1,80 @@
+"""This module contains a small in-process LRU cache with TTL."""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterator, Optional, Tuple
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a time to live.\n
+    Meant to be used from a single event loop, so it takes no locks."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        max_weight: Optional[int] = None,
+        weigher: Optional[Callable[[Any], int]] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """:param maxsize: max qty of entries kept, least recently used ones are evicted first.
+        :param ttl: default seconds an entry is considered fresh.
+        :param max_weight: optional bound on the sum of entry weights (e.g. bytes).
+        :param weigher: returns the weight of a value, required with max_weight.
+        :param timer: monotonic clock used to expire entries."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self._weigher = weigher or (lambda value: 0)
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.weight = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _discard(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        item = self._data.pop(key, None)
+        if item is not None:
+            self.weight -= self._weigher(item[1])
+        return item
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh value for key, default if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at <= self._timer():
+            self._discard(key)
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key for ttl seconds (cache default when None)."""
+        ttl = self.ttl if ttl is None else ttl
+        weight = self._weigher(value)
+        self._discard(key)
+        if ttl <= 0 or self.maxsize <= 0 or (self.max_weight is not None and weight > self.max_weight):
+            return
+
+        self._data[key] = (self._timer() + ttl, value)
+        self.weight += weight
+        while len(self._data) > self.maxsize or (self.max_weight is not None and self.weight > self.max_weight):
+            self._discard(next(iter(self._data)))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value, default if missing."""
+        item = self._discard(key)
+        return default if item is None else item[1]
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Iterate over a snapshot of (key, value) pairs, expired ones included."""
+        return ((key, value) for key, (_, value) in list(self._data.items()))
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
+        self.weight = 0
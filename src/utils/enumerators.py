@@ -5,3 +5,29 @@ class UserType(Enum):
     """User system rol."""
     ADMIN = "admin"
     ANONYMOUS = "anonymous"
+
+
+class ImportRowStatus(Enum):
+    """Outcome of a row in a bulk import."""
+    CREATED = "created"
+    UPDATED = "updated"
+    FAILED = "failed"
+
+
+class ImportFormat(Enum):
+    """Accepted bulk import/export payload formats."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ProductSortField(Enum):
+    """Columns products can be sorted by."""
+    NAME = "name"
+    PRICE = "price"
+    CREATED_AT = "created_at"
+
+
+class SortOrder(Enum):
+    """Sort direction."""
+    ASC = "asc"
+    DESC = "desc"
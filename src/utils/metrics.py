@@ -0,0 +1,133 @@
+"""This module keeps low overhead in-process metrics in Prometheus text format."""
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+class Histogram:
+    """Fixed bucket histogram; observe() only bumps a few numbers."""
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: Sequence[Tuple[str, str]] = ()) -> List[str]:
+        """Render as Prometheus histogram sample lines."""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels([*labels, ('le', repr(bound))])} {cumulative}")
+        lines.append(f"{name}_bucket{_labels([*labels, ('le', '+Inf')])} {self.count}")
+        lines.append(f"{name}_sum{_labels(labels)} {self.sum}")
+        lines.append(f"{name}_count{_labels(labels)} {self.count}")
+        return lines
+
+
+class RouteStats:
+    """Request count by status and latency histogram of one route."""
+    __slots__ = ("method", "route", "statuses", "latency")
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.statuses: Dict[int, int] = {}
+        self.latency = Histogram()
+
+    def observe(self, status_code: int, seconds: float) -> None:
+        """Record a finished request."""
+        self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+        self.latency.observe(seconds)
+
+
+class MetricsRegistry:
+    """Holds every metric of this process and renders them for scraping.\n
+    Series are created once per route; the hot path only does a dict lookup
+    and a few integer/float additions."""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self.in_flight = 0
+        self._routes: Dict[Any, RouteStats] = {}
+        self._histograms: Dict[str, Tuple[str, Histogram]] = {}
+        self._gauges: List[Tuple[str, str, Callable[[], Any]]] = []
+
+    def route_stats(self, route: Any, method: str, path: str) -> RouteStats:
+        """Return the stats of a route, created on its first request."""
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = RouteStats(method=method, route=path)
+        return stats
+
+    def histogram(self, name: str, description: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Create (or return) an unlabeled histogram."""
+        if name not in self._histograms:
+            self._histograms[name] = (description, Histogram(buckets))
+        return self._histograms[name][1]
+
+    def gauge(self, name: str, description: str, callback: Callable[[], Any]) -> None:
+        """Register a gauge whose value is read at scrape time."""
+        self._gauges.append((name, description, callback))
+
+    def render(self) -> str:
+        """Render every metric in Prometheus text exposition format."""
+        ns = self.namespace
+        lines = [
+            f"# HELP {ns}_http_requests_in_flight Requests being handled.",
+            f"# TYPE {ns}_http_requests_in_flight gauge",
+            f"{ns}_http_requests_in_flight {self.in_flight}",
+            f"# HELP {ns}_http_requests_total Handled requests by route and status.",
+            f"# TYPE {ns}_http_requests_total counter",
+        ]
+        routes = list(self._routes.values())
+        for stats in routes:
+            for status_code, count in list(stats.statuses.items()):
+                labels = [("method", stats.method), ("route", stats.route), ("status", str(status_code))]
+                lines.append(f"{ns}_http_requests_total{_labels(labels)} {count}")
+
+        lines.append(f"# HELP {ns}_http_request_duration_seconds Request latency by route.")
+        lines.append(f"# TYPE {ns}_http_request_duration_seconds histogram")
+        for stats in routes:
+            lines.extend(stats.latency.render(
+                f"{ns}_http_request_duration_seconds", [("method", stats.method), ("route", stats.route)]
+            ))
+
+        for name, (description, histogram) in list(self._histograms.items()):
+            lines.append(f"# HELP {ns}_{name} {description}")
+            lines.append(f"# TYPE {ns}_{name} histogram")
+            lines.extend(histogram.render(f"{ns}_{name}"))
+
+        for name, description, callback in self._gauges:
+            lines.append(f"# HELP {ns}_{name} {description}")
+            lines.append(f"# TYPE {ns}_{name} gauge")
+            lines.append(f"{ns}_{name} {callback()}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry(namespace="catalog")
+
+bcrypt_queue_seconds = metrics.histogram(
+    "bcrypt_queue_seconds", "Seconds a hash/verify waited before a bcrypt thread picked it up."
+)
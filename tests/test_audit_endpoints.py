@@ -0,0 +1,40 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from src.crud import audit_crud
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def page_calls(monkeypatch):
+    """Arguments of every get_filtered_page call, each returning an empty page."""
+    calls = []
+
+    async def get_filtered_page(**kwargs):
+        calls.append(kwargs)
+        return [], None
+
+    monkeypatch.setattr(audit_crud, "get_filtered_page", get_filtered_page)
+    return calls
+
+
+async def test_mixed_naive_and_aware_bounds_are_compared_in_utc(client, page_calls):
+    response = await client.get(
+        "/audit/", params={"since": "2025-01-01T00:00:00Z", "until": "2025-01-02T00:00:00"}
+    )
+
+    assert response.status_code == 404
+    assert page_calls[0]["since"] == datetime(2025, 1, 1, tzinfo=UTC)
+    assert page_calls[0]["until"] == datetime(2025, 1, 2, tzinfo=UTC)
+
+
+async def test_naive_since_after_aware_until_is_rejected(client, page_calls):
+    response = await client.get(
+        "/audit/", params={"since": "2025-01-02T00:00:00", "until": "2025-01-01T00:00:00+00:00"}
+    )
+
+    assert response.status_code == 400
+    assert not page_calls
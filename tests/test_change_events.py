@@ -0,0 +1,39 @@
+import json
+import uuid
+
+import pytest
+
+from src.services.change_events import ChangeListener
+
+
+@pytest.fixture
+def listener():
+    """Listener recording the events dispatched to products handlers, never connected."""
+    listener = ChangeListener(dsn="postgresql://unused", channel="test", reconnect_interval=1)
+    listener.events = []
+    listener.subscribe("products", lambda op, ids: listener.events.append((op, ids)))
+    return listener
+
+
+def notify(listener: ChangeListener, payload: str) -> None:
+    listener._on_notification(None, 0, "test", payload)
+
+
+def test_event_of_another_worker_is_dispatched(listener):
+    product_id = uuid.uuid4()
+    notify(listener, json.dumps({"origin": "other", "table": "products", "op": "update", "ids": [str(product_id)]}))
+
+    assert listener.events == [("update", [product_id])]
+
+
+@pytest.mark.parametrize("payload", [
+    "not json",
+    json.dumps({"origin": "other", "op": "update", "ids": []}),
+    json.dumps({"origin": "other", "table": "products", "ids": []}),
+    json.dumps({"origin": "other", "table": "products", "op": "update", "ids": ["not-a-uuid"]}),
+    json.dumps(["products"]),
+])
+def test_malformed_event_is_ignored(listener, payload):
+    notify(listener, payload)
+
+    assert listener.events == []
@@ -0,0 +1,86 @@
+import base64
+import json
+import uuid
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.helpers.pagination import (ORIGIN, decode_change_token, decode_cursor,
+                                    encode_change_token, encode_cursor)
+from src.middlewares.exceptions import BadRequestException
+
+
+def token_of(value) -> str:
+    """Encode any JSON value the way cursors are, to forge malformed ones."""
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+MALFORMED = [
+    "garbage",
+    "!!!",
+    base64.urlsafe_b64encode(b"\xff\xfe\xfd").decode(),
+    token_of(5),
+    token_of({"created_at": "2025-01-01T00:00:00+00:00", "id": str(uuid.uuid4())}),
+    token_of([1, 2]),
+    token_of(["2025-01-01T00:00:00+00:00"]),
+    token_of(["2025-01-01T00:00:00+00:00", "not-a-uuid"]),
+    token_of(["yesterday", str(uuid.uuid4())]),
+]
+
+
+def test_cursor_round_trip():
+    row = SimpleNamespace(created_at=datetime(2025, 8, 13, 20, 15, 30, 123456, tzinfo=UTC), id=uuid.uuid4())
+
+    cursor = encode_cursor(row)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (row.created_at, row.id)
+
+
+@pytest.mark.parametrize("cursor", [None, ""])
+def test_missing_cursor_starts_from_the_first_page(cursor):
+    assert decode_cursor(cursor) is None
+
+
+@pytest.mark.parametrize("cursor", MALFORMED)
+def test_malformed_cursor_is_a_bad_request(cursor):
+    with pytest.raises(BadRequestException) as exc_info:
+        decode_cursor(cursor)
+
+    assert exc_info.value.status_code == 400
+
+
+def test_change_token_round_trip():
+    changed_after = (datetime(2025, 8, 13, 20, 15, 30, tzinfo=UTC), uuid.uuid4())
+    deleted_after = (datetime(2025, 8, 14, 8, 0, 0, 1, tzinfo=UTC), uuid.uuid4())
+
+    token = encode_change_token(changed_after, deleted_after)
+
+    assert decode_change_token(token) == (changed_after, deleted_after)
+
+
+@pytest.mark.parametrize("token", [None, ""])
+def test_missing_change_token_reads_from_the_beginning(token):
+    assert decode_change_token(token) == (ORIGIN, ORIGIN)
+
+
+@pytest.mark.parametrize("token", MALFORMED + [token_of(["2025-01-01T00:00:00+00:00", str(uuid.uuid4())])])
+def test_malformed_change_token_is_a_bad_request(token):
+    with pytest.raises(BadRequestException) as exc_info:
+        decode_change_token(token)
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("url", [
+    "/products/?cursor=garbage",
+    "/products/changes?since=garbage",
+    "/users/?cursor=garbage",
+    "/audit/?cursor=garbage",
+])
+async def test_endpoints_answer_400_to_malformed_tokens(client, url):
+    response = await client.get(url)
+
+    assert response.status_code == 400
@@ -0,0 +1,167 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from src.crud import product_crud
+from src.services.audit import AuditService
+from src.services.email import EmailService
+from src.services.product_cache import ProductCache, product_cache
+
+
+UPDATED_AT = datetime(2025, 8, 13, 20, 25, 45, 123456, tzinfo=UTC)
+
+
+def make_product(**changes) -> SimpleNamespace:
+    product = SimpleNamespace(
+        id=uuid.uuid4(), sku="PROD-001", name="Sample Product", price=99.99, brand="Nike",
+        created_at=UPDATED_AT - timedelta(days=1), updated_at=UPDATED_AT,
+    )
+    product.__dict__.update(changes)
+    return product
+
+
+ETAG = ProductCache.make_etag(make_product())
+
+
+def test_etag_round_trips_to_updated_at():
+    assert ProductCache.parse_etags(ETAG) == [UPDATED_AT]
+
+
+def test_etag_of_a_never_updated_product_uses_created_at():
+    product = make_product(updated_at=None)
+
+    assert ProductCache.parse_etags(ProductCache.make_etag(product)) == [product.created_at]
+
+
+@pytest.mark.parametrize("if_match, versions", [
+    (f"{ETAG}, W/{ETAG}", [UPDATED_AT]),
+    (f' "zz", {ETAG} ,"1"', [UPDATED_AT, datetime(1970, 1, 1, 0, 0, 0, 1, tzinfo=UTC)]),
+    (f"W/{ETAG}", []),
+    (ETAG.strip('"'), []),
+    ('""', []),
+    ('"not-hex"', []),
+    ('"ffffffffffffffffffffffff"', []),
+    ("", []),
+])
+def test_parse_etags_skips_weak_and_foreign_tags(if_match, versions):
+    assert ProductCache.parse_etags(if_match) == versions
+
+
+@pytest.mark.parametrize("if_none_match, matches", [
+    (ETAG, True),
+    (f"W/{ETAG}", True),
+    (f'"other", {ETAG}', True),
+    ("*", True),
+    ('"other"', False),
+    ("", False),
+    (None, False),
+])
+def test_if_none_match_uses_weak_comparison(if_none_match, matches):
+    assert ProductCache.etag_matches(if_none_match, ETAG) is matches
+
+
+@pytest.fixture(autouse=True)
+def empty_product_cache():
+    product_cache.invalidate()
+    yield
+    product_cache.invalidate()
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    """Product returned by product_crud.get, None to make it missing."""
+    state = SimpleNamespace(product=make_product(), updates=[])
+
+    async def get(db, id):
+        return state.product if state.product is not None and state.product.id == id else None
+
+    async def update_returning(db, id, obj_in, expected_updated_at=None, **kwargs):
+        state.updates.append(expected_updated_at)
+        product = state.product
+        if product is None or product.id != id:
+            return None
+        if expected_updated_at is not None and product.updated_at not in expected_updated_at:
+            return None
+        return make_product(**{**vars(product), **obj_in, "updated_at": product.updated_at + timedelta(seconds=1)})
+
+    async def register(*args, **kwargs):
+        pass
+
+    async def notify_admin(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(product_crud, "get", get)
+    monkeypatch.setattr(product_crud, "update_returning", update_returning)
+    monkeypatch.setattr(AuditService, "register", register)
+    monkeypatch.setattr(EmailService, "notify_admin", notify_admin)
+    return state
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_get_answers_304_to_a_current_etag(client, stored):
+    url = f"/products/{stored.product.id}"
+
+    response = await client.get(url)
+    assert response.status_code == 200
+    assert response.headers["etag"] == ETAG
+    assert response.json()["sku"] == "PROD-001"
+
+    response = await client.get(url, headers={"If-None-Match": ETAG})
+    assert response.status_code == 304
+    assert response.headers["etag"] == ETAG
+    assert response.content == b""
+
+    response = await client.get(url, headers={"If-None-Match": '"0"'})
+    assert response.status_code == 200
+
+
+async def test_patch_with_current_etag_returns_the_new_one(client, stored):
+    response = await client.patch(
+        f"/products/{stored.product.id}", json={"price": 10}, headers={"If-Match": ETAG}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["price"] == 10
+    assert stored.updates == [[UPDATED_AT]]
+    assert ProductCache.parse_etags(response.headers["etag"]) == [UPDATED_AT + timedelta(seconds=1)]
+
+
+async def test_patch_without_if_match_or_with_star_skips_the_check(client, stored):
+    for headers in ({}, {"If-Match": "*"}):
+        response = await client.patch(f"/products/{stored.product.id}", json={"price": 10}, headers=headers)
+        assert response.status_code == 200
+
+    assert stored.updates == [None, None]
+
+
+@pytest.mark.parametrize("if_match", ['"0"', f"W/{ETAG}", "garbage"])
+async def test_patch_with_stale_weak_or_malformed_etag_is_412(client, stored, if_match):
+    response = await client.patch(
+        f"/products/{stored.product.id}", json={"price": 10}, headers={"If-Match": if_match}
+    )
+
+    assert response.status_code == 412
+
+
+async def test_malformed_if_match_is_rejected_before_updating(client, stored):
+    await client.patch(f"/products/{stored.product.id}", json={"price": 10}, headers={"If-Match": "garbage"})
+
+    assert stored.updates == []
+
+
+@pytest.mark.parametrize("headers", [{}, {"If-Match": ETAG}])
+async def test_patch_of_a_missing_product_is_404(client, stored, headers):
+    response = await client.patch(f"/products/{uuid.uuid4()}", json={"price": 10}, headers=headers)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("body", [{}, {"price": None}])
+async def test_patch_needs_at_least_one_non_null_field(client, stored, body):
+    response = await client.patch(f"/products/{stored.product.id}", json=body)
+
+    assert response.status_code == 422
@@ -0,0 +1,141 @@
+from typing import List
+
+import pytest
+
+from src.config.core import core_settings
+from src.middlewares.exceptions import BadRequestException
+from src.services.product_import import ProductImportService, iter_records
+from src.utils.enumerators import ImportFormat, ImportRowStatus
+
+
+pytestmark = pytest.mark.anyio
+
+
+class StreamedRequest:
+    """Request whose body arrives in the given chunks."""
+
+    def __init__(self, *chunks: bytes):
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+async def records(fmt: ImportFormat, *chunks: bytes) -> List:
+    return [record async for record in iter_records(StreamedRequest(*chunks), fmt)]
+
+
+async def test_ndjson_rows_are_numbered_skipping_blank_lines():
+    result = await records(
+        ImportFormat.NDJSON,
+        b'{"sku": "A1"}\r\n\n  \n{"sku"', b': "A2"}\n{bad json\n[1]',
+    )
+
+    assert [row for row, _ in result] == [1, 2, 3, 4]
+    assert result[0][1] == {"sku": "A1"}
+    assert result[1][1] == {"sku": "A2"}
+    assert isinstance(result[2][1], ValueError)
+    assert result[3][1] == [1]
+
+
+async def test_csv_rows_are_mapped_by_header():
+    result = await records(
+        ImportFormat.CSV,
+        b" sku , name,price,brand\r\nC1,Name,2.5,z\r\nC2,\"Name, with comma\",3,\"say \"\"hi\"\"\"\r\n",
+    )
+
+    assert result == [
+        (1, {"sku": "C1", "name": "Name", "price": "2.5", "brand": "z"}),
+        (2, {"sku": "C2", "name": "Name, with comma", "price": "3", "brand": 'say "hi"'}),
+    ]
+
+
+async def test_csv_quoted_fields_may_hold_line_breaks():
+    result = await records(
+        ImportFormat.CSV,
+        b'sku,name,price,brand\nM1,"first\n\nlast",2,z\nM2,N2,3,z\n',
+    )
+
+    assert result == [
+        (1, {"sku": "M1", "name": "first\n\nlast", "price": "2", "brand": "z"}),
+        (2, {"sku": "M2", "name": "N2", "price": "3", "brand": "z"}),
+    ]
+
+
+async def test_csv_rows_that_cant_be_parsed_fail_alone():
+    result = await records(
+        ImportFormat.CSV,
+        b'sku,name,price,brand\nC1,N1,2\nC2,N2,3,z\nC3,"unterminated,4,z\n',
+    )
+
+    assert [row for row, _ in result] == [1, 2, 3]
+    assert str(result[0][1]) == "Expected 4 columns, got 3."
+    assert result[1][1] == {"sku": "C2", "name": "N2", "price": "3", "brand": "z"}
+    assert isinstance(result[2][1], ValueError)
+
+
+async def test_multibyte_characters_may_be_split_across_chunks():
+    body = '{"name": "Café"}\n'.encode()
+    split = body.index("é".encode()) + 1
+
+    assert await records(ImportFormat.NDJSON, body[:split], body[split:]) == [(1, {"name": "Café"})]
+
+
+@pytest.mark.parametrize("chunks, offset", [
+    ((b'{"sku": "A1"}\n\xff\n',), 14),
+    ((b'{"sku": "A1"}\n', b"\xc3\x28"), 14),
+    ((b'{"sku": "A1"}\n\xc3',), 14),
+])
+async def test_body_that_isnt_utf8_is_a_bad_request(chunks, offset):
+    with pytest.raises(BadRequestException) as exc_info:
+        await records(ImportFormat.NDJSON, *chunks)
+
+    assert exc_info.value.status_code == 400
+    assert f"at byte {offset}." in exc_info.value.detail["message"]
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Batches the import would upsert, recorded instead of written."""
+    flushed = []
+
+    async def flush(self, batch):
+        if batch:
+            flushed.append(list(batch))
+
+    monkeypatch.setattr(ProductImportService, "_flush", flush)
+    return flushed
+
+
+async def test_invalid_rows_are_reported_and_valid_ones_upserted(batches):
+    body = (
+        b'{"sku": "A1", "name": "N1", "price": 1, "brand": "x"}\n'
+        b'{"sku": "A2", "name": "N2", "price": -1, "brand": "x"}\n'
+        b'"nope"\n'
+        b'{"sku": "A3", "name": "N3", "price": 3, "brand": "x"}\n'
+    )
+    service = ProductImportService(db=None, current_user=None, request=StreamedRequest(body))
+
+    report = await service.run(fmt=ImportFormat.NDJSON)
+
+    assert batches == [["A1", "A3"]]
+    assert report.failed == 2
+    assert [(result.row, result.sku, result.status) for result in report.results] == [
+        (2, "A2", ImportRowStatus.FAILED), (3, None, ImportRowStatus.FAILED),
+    ]
+    assert "price" in report.results[0].errors[0]
+
+
+async def test_rows_past_the_limit_are_reported_not_imported(batches, monkeypatch):
+    monkeypatch.setattr(core_settings, "PRODUCT_IMPORT_MAX_ROWS", 2)
+    body = b"".join(
+        b'{"sku": "L%d", "name": "N%d", "price": 1, "brand": "x"}\n' % (i, i) for i in range(4)
+    )
+    service = ProductImportService(db=None, current_user=None, request=StreamedRequest(body))
+
+    report = await service.run(fmt=ImportFormat.NDJSON)
+
+    assert batches == [["L0", "L1"]]
+    assert [(result.row, result.status) for result in report.results] == [(3, ImportRowStatus.FAILED)]
+    assert "limited to 2 rows" in report.results[0].errors[0]